@@ -0,0 +1,88 @@
+import fnmatch
+import sys
+
+import click
+
+from . import backends, daemon, framing, harness, startup, transactions
+
+SUITES = {
+    'backends': backends.benchmarks,
+    'daemon': daemon.benchmarks,
+    'framing': framing.benchmarks,
+    'startup': startup.benchmarks,
+    'transactions': transactions.benchmarks,
+}
+
+
+@click.group()
+def main():
+    """
+    Benchmark polyswarmtransaction. Run from the repository root with `python -m benchmarks`.
+    """
+
+
+@main.command()
+@click.option('--suite', '-s', 'suites', type=click.Choice(sorted(SUITES)), multiple=True,
+              help='Suites to run, all of them by default')
+@click.option('--filter', '-k', 'patterns', multiple=True, help='Only run benchmarks matching this glob')
+@click.option('--min-time', type=float, default=0.5, show_default=True, help='Seconds spent timing each benchmark')
+@click.option('--output', '-o', type=click.Path(dir_okay=False), help='Write results as JSON to this file')
+@click.option('--baseline', '-b', type=click.Path(exists=True, dir_okay=False),
+              help='Compare against these stored results, failing on regressions')
+@click.option('--threshold', '-t', type=float, default=0.1, show_default=True,
+              help='Largest accepted throughput loss against the baseline, 0.1 being 10%')
+def run(suites, patterns, min_time, output, baseline, threshold):
+    """
+    Run benchmarks, reporting ops/sec, latency percentiles and peak memory
+    """
+    results = []
+    for suite in suites or sorted(SUITES):
+        for benchmark in SUITES[suite]():
+            if patterns and not any(fnmatch.fnmatchcase(benchmark.name, pattern) for pattern in patterns):
+                continue
+            result = harness.run(benchmark, min_time=min_time)
+            click.echo(format_result(result))
+            results.append(result)
+
+    if output:
+        harness.dump(results, output)
+
+    if baseline:
+        report(harness.load(baseline), {result.name: result for result in results}, threshold)
+
+
+@main.command()
+@click.argument('baseline', type=click.Path(exists=True, dir_okay=False))
+@click.argument('current', type=click.Path(exists=True, dir_okay=False))
+@click.option('--threshold', '-t', type=float, default=0.1, show_default=True,
+              help='Largest accepted throughput loss against the baseline, 0.1 being 10%')
+def compare(baseline, current, threshold):
+    """
+    Compare two stored runs, failing when CURRENT is slower than BASELINE by more than the threshold
+    """
+    report(harness.load(baseline), harness.load(current), threshold)
+
+
+def format_result(result: harness.Result) -> str:
+    info = ''.join(f'  {key} {value}' for key, value in result.info.items())
+    return (f'{result.name:<56} {result.ops_per_sec:>12,.1f} ops/s  '
+            f'p50 {result.p50 * 1e6:>10,.1f}us  p90 {result.p90 * 1e6:>10,.1f}us  p99 {result.p99 * 1e6:>10,.1f}us  '
+            f'peak {result.peak_memory / 1024:>10,.1f}KiB{info}')
+
+
+def report(baseline, current, threshold):
+    comparisons = harness.compare(baseline, current)
+    for comparison in comparisons:
+        click.echo(f'{comparison.name:<56} {comparison.baseline:>12,.1f} -> {comparison.current:>12,.1f} ops/s '
+                   f'{comparison.change:>+8.1%}')
+
+    regressed = harness.regressions(comparisons, threshold)
+    if regressed:
+        click.echo(f'{len(regressed)} benchmarks regressed by more than {threshold:.0%}:', err=True)
+        for comparison in regressed:
+            click.echo(f'  {comparison.name} {comparison.change:+.1%}', err=True)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator
+
+from eth_keys.datatypes import PrivateKey, PublicKey
+
+from polyswarmtransaction import hashing
+from polyswarmtransaction.transaction import available_ecc_backends, load_ecc_backend
+
+from .harness import Benchmark
+
+PRIVATE_KEY = bytes([1] * 32)
+THREADS = (1, 2, 4, 8)
+# Operations per measured call when spread over threads
+BATCH = 64
+
+
+def benchmarks() -> Iterator[Benchmark]:
+    """
+    Sign and recover with every installed eth_keys backend, alone and from several threads at once
+    """
+    message_hash = hashing.keccak('{"name": "polyswarmtransaction.bounty:VoteTransaction"}')
+    for name in available_ecc_backends():
+        backend = load_ecc_backend(name)
+        private_key = PrivateKey(PRIVATE_KEY, backend=backend)
+        signature = backend.ecdsa_sign(message_hash, private_key)
+
+        def sign(backend=backend, private_key=private_key):
+            return backend.ecdsa_sign(message_hash, private_key)
+
+        def recover(backend=backend, signature=signature):
+            return PublicKey.recover_from_msg_hash(message_hash, signature, backend=backend)
+
+        for operation, fn in (('sign', sign), ('recover', recover)):
+            yield Benchmark(f'{operation}:{name}', fn, {'backend': name})
+            for threads in THREADS:
+                yield Benchmark(f'{operation}:{name}:threads={threads}', threaded(fn, threads),
+                                {'backend': name, 'threads': threads}, operations=BATCH)
+
+
+def threaded(fn, threads: int):
+    executor = ThreadPoolExecutor(threads)
+
+    def run_batch():
+        futures = [executor.submit(fn) for _ in range(BATCH)]
+        for future in futures:
+            future.result()
+
+    return run_batch
@@ -0,0 +1,30 @@
+import os
+import tempfile
+import threading
+
+from typing import Iterator
+
+from polyswarmtransaction.daemon import SigningClient, SigningServer
+from polyswarmtransaction.transaction import CustomTransaction, Signer
+
+from .harness import Benchmark
+from .transactions import PRIVATE_KEY
+
+PAYLOAD = '{"guid": "4a4ad2fc-b6c5-4d2a-a3b2-6d6a7b4b3b61", "verdict": true}'
+PIPELINED = 64
+
+
+def benchmarks() -> Iterator[Benchmark]:
+    """
+    Sign through a signing daemon, one request at a time and pipelined, against signing in process
+    """
+    signer = Signer(PRIVATE_KEY)
+    path = os.path.join(tempfile.mkdtemp(), 'signer.sock')
+    server = SigningServer(path, signer)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    client = SigningClient(path)
+
+    yield Benchmark('sign:in_process', lambda: signer.sign(CustomTransaction(data_body=PAYLOAD)))
+    yield Benchmark('sign:daemon', lambda: client.sign(PAYLOAD))
+    yield Benchmark(f'sign:daemon[pipelined x{PIPELINED}]', lambda: list(client.sign_many([PAYLOAD] * PIPELINED)),
+                    operations=PIPELINED)
@@ -0,0 +1,45 @@
+import io
+import json
+
+from typing import Callable, Dict, Iterator, Tuple
+from urllib.parse import parse_qsl, urlencode
+
+from polyswarmtransaction.framing import FrameReader, FrameWriter
+from polyswarmtransaction.transaction import SignedTransaction
+
+from .harness import Benchmark
+from .transactions import PRIVATE_KEY, transactions
+
+NAMES = ('VoteTransaction', 'AssertionTransaction[16]', 'BountyTransaction[1]', 'BountyTransaction[256]')
+STREAM_SIZE = 1000
+
+# Encoder and decoder of each transport encoding of a SignedTransaction
+ENCODINGS: Dict[str, Tuple[Callable[[SignedTransaction], bytes], Callable[[bytes], SignedTransaction]]] = {
+    'binary': (SignedTransaction.encode, SignedTransaction.decode),
+    'json': (lambda signed: json.dumps(signed.payload).encode(), lambda data: SignedTransaction(**json.loads(data))),
+    'form': (lambda signed: urlencode(signed.payload).encode(),
+             lambda data: SignedTransaction(**dict(parse_qsl(data.decode(), strict_parsing=True)))),
+}
+
+
+def read_stream(data: bytes) -> int:
+    return sum(1 for _ in FrameReader(io.BytesIO(data)))
+
+
+def benchmarks() -> Iterator[Benchmark]:
+    for name, transaction in transactions():
+        if name not in NAMES:
+            continue
+
+        signed = transaction.sign(PRIVATE_KEY)
+        for encoding, (encode, decode) in ENCODINGS.items():
+            encoded = encode(signed)
+            assert decode(encoded).payload == signed.payload
+            info = {'bytes': len(encoded)}
+            yield Benchmark(f'encode:{encoding}:{name}', lambda encode=encode: encode(signed), info)
+            yield Benchmark(f'decode:{encoding}:{name}', lambda decode=decode, encoded=encoded: decode(encoded), info)
+
+        stream = io.BytesIO()
+        FrameWriter(stream).write_many([signed] * STREAM_SIZE)
+        yield Benchmark(f'read_frames:{name}[x{STREAM_SIZE}]', lambda data=stream.getvalue(): read_stream(data),
+                        {'bytes': len(stream.getvalue())})
@@ -0,0 +1,148 @@
+import dataclasses
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+from typing import Any, Callable, Dict, Iterable, List
+
+
+@dataclasses.dataclass
+class Benchmark:
+    """
+    A named operation, `fn` is called once per measured iteration and runs `operations` of them.
+    Latencies are per call, throughput per operation. `info` is reported along with the results.
+    """
+    name: str
+    fn: Callable[[], Any]
+    info: Dict[str, Any] = dataclasses.field(default_factory=dict)
+    operations: int = 1
+
+
+@dataclasses.dataclass
+class Result:
+    name: str
+    iterations: int
+    ops_per_sec: float
+    p50: float
+    p90: float
+    p99: float
+    max: float
+    peak_memory: int
+    info: Dict[str, Any] = dataclasses.field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Result':
+        return cls(**{field.name: data[field.name] for field in dataclasses.fields(cls) if field.name in data})
+
+
+def percentile(ordered: List[float], fraction: float) -> float:
+    """
+    Nearest rank percentile of already sorted `ordered`
+    """
+    index = max(0, min(len(ordered) - 1, int(round(fraction * len(ordered))) - 1))
+    return ordered[index]
+
+
+def measure_peak_memory(fn: Callable[[], Any], iterations: int = 3) -> int:
+    """
+    Peak bytes allocated while running `fn`, above what was allocated before.
+    Run apart from the timing since tracemalloc slows every allocation down.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        for _ in range(iterations):
+            fn()
+        return tracemalloc.get_traced_memory()[1] - baseline
+    finally:
+        tracemalloc.stop()
+
+
+def run(benchmark: Benchmark, min_time: float = 0.5, min_iterations: int = 5, max_iterations: int = 100000,
+        warmup: int = 2) -> Result:
+    """
+    Time `benchmark` for at least `min_time` seconds and `min_iterations` iterations. Latencies are in seconds.
+    """
+    fn = benchmark.fn
+    for _ in range(warmup):
+        fn()
+
+    latencies = []
+    clock = time.perf_counter
+    total = 0.0
+    while (total < min_time or len(latencies) < min_iterations) and len(latencies) < max_iterations:
+        start = clock()
+        fn()
+        elapsed = clock() - start
+        latencies.append(elapsed)
+        total += elapsed
+
+    latencies.sort()
+    return Result(name=benchmark.name,
+                  iterations=len(latencies),
+                  ops_per_sec=len(latencies) * benchmark.operations / total if total else float('inf'),
+                  p50=percentile(latencies, 0.5),
+                  p90=percentile(latencies, 0.9),
+                  p99=percentile(latencies, 0.99),
+                  max=latencies[-1],
+                  peak_memory=measure_peak_memory(fn),
+                  info=dict(benchmark.info))
+
+
+def environment() -> Dict[str, str]:
+    return {
+        'python': sys.version.split()[0],
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+    }
+
+
+def dump(results: Iterable[Result], path: str):
+    document = {
+        'environment': environment(),
+        'results': [dataclasses.asdict(result) for result in results],
+    }
+    with open(path, 'w') as f:
+        json.dump(document, f, indent=2)
+        f.write('\n')
+
+
+def load(path: str) -> Dict[str, Result]:
+    with open(path) as f:
+        document = json.load(f)
+    return {data['name']: Result.from_dict(data) for data in document['results']}
+
+
+@dataclasses.dataclass
+class Comparison:
+    name: str
+    baseline: float
+    current: float
+
+    @property
+    def change(self) -> float:
+        """
+        Relative throughput change, negative when slower
+        """
+        return self.current / self.baseline - 1
+
+
+def compare(baseline: Dict[str, Result], current: Dict[str, Result]) -> List[Comparison]:
+    """
+    Throughput of every benchmark found in both runs
+    """
+    return [Comparison(name, baseline[name].ops_per_sec, result.ops_per_sec)
+            for name, result in current.items() if name in baseline]
+
+
+def regressions(comparisons: Iterable[Comparison], threshold: float) -> List[Comparison]:
+    """
+    Comparisons slower than their baseline by more than `threshold`, 0.1 being 10%
+    """
+    return [comparison for comparison in comparisons if comparison.change < -threshold]
@@ -0,0 +1,37 @@
+import json
+import subprocess
+import sys
+
+from typing import Iterator, List
+
+from .harness import Benchmark
+
+# Modules only loaded on first use. Importing any of them along with the package is a startup regression.
+LAZY_MODULES = ('asyncio', 'concurrent.futures', 'Crypto', 'eth_account', 'eth_hash', 'eth_keys', 'eth_utils',
+                'jsonschema', 'multiprocessing', 'web3')
+
+# Fresh interpreters running each statement, `python` alone being the floor for the others
+STATEMENTS = {
+    'python': 'pass',
+    'import': 'import polyswarmtransaction',
+    'import:bounty': 'import polyswarmtransaction.bounty',
+    'cli': 'import polyswarmtransaction.__main__',
+}
+
+
+def loaded_lazy_modules(statement: str) -> List[str]:
+    """
+    Lazy modules loaded by running `statement` in a fresh interpreter
+    """
+    check = f'{statement}\nimport json, sys\nprint(json.dumps([m for m in {LAZY_MODULES!r} if m in sys.modules]))'
+    return json.loads(subprocess.run([sys.executable, '-c', check], check=True, stdout=subprocess.PIPE).stdout)
+
+
+def benchmarks() -> Iterator[Benchmark]:
+    """
+    Start a new interpreter per call, timing the package import the way short-lived workers pay for it
+    """
+    for name, statement in STATEMENTS.items():
+        command = [sys.executable, '-c', statement]
+        yield Benchmark(f'startup:{name}', lambda command=command: subprocess.run(command, check=True),
+                        {'lazy_modules_loaded': ','.join(loaded_lazy_modules(statement)) or None})
@@ -0,0 +1,80 @@
+import json
+
+from typing import Any, Dict, Iterator, List, Tuple
+
+from polyswarmartifact.schema.bounty import Bounty as BountyMetadata
+from polyswarmartifact.schema.verdict import Verdict as VerdictMetadata
+from polyswarmtransaction.bounty import AssertionTransaction, BountyTransaction, VoteTransaction
+from polyswarmtransaction.nectar import ApproveNectarReleaseTransaction, WithdrawalTransaction
+from polyswarmtransaction.cache import KeyDirectory
+from polyswarmtransaction.transaction import CustomTransaction, SignedTransaction, Signer, Transaction
+
+from .harness import Benchmark
+
+PRIVATE_KEY = bytes([1] * 32)
+GUID = '4a4ad2fc-b6c5-4d2a-a3b2-6d6a7b4b3b61'
+
+# From a single artifact or scanner signature up to the 256 artifacts limit of bounty metadata
+SIZES = (1, 16, 256)
+
+
+def bounty_metadata(artifacts: int) -> List[Dict[str, Any]]:
+    metadata = BountyMetadata()
+    for i in range(artifacts):
+        metadata.add_file_artifact(mimetype='application/x-dosexec', filename=f'sample-{i}.exe', filesize=i + 1,
+                                   sha256='a' * 64, sha1='b' * 40, md5='c' * 32)
+    return json.loads(metadata.json())
+
+
+def verdict_metadata(signatures: int) -> Dict[str, Any]:
+    metadata = VerdictMetadata().set_malware_family('Eicar').set_scanner(operating_system='Linux',
+                                                                         architecture='x86_64',
+                                                                         version='1.0.0',
+                                                                         vendor_version='2.0')
+    loaded = json.loads(metadata.json())
+    loaded['scanner']['signatures'] = [f'Win.Trojan.Sample-{i}' for i in range(signatures)]
+    return loaded
+
+
+def transactions() -> Iterator[Tuple[str, Transaction]]:
+    """
+    One transaction of every built-in class, for each metadata size when it has any
+    """
+    for size in SIZES:
+        yield f'BountyTransaction[{size}]', BountyTransaction(GUID, '62500000000000000', 'QmArtifact', 0, 300,
+                                                              bounty_metadata(size))
+    for size in SIZES:
+        yield f'AssertionTransaction[{size}]', AssertionTransaction(GUID, True, '62500000000000000',
+                                                                    verdict_metadata(size))
+    yield 'VoteTransaction', VoteTransaction(GUID, True)
+    yield 'WithdrawalTransaction', WithdrawalTransaction('2000000000000000000')
+    yield 'ApproveNectarReleaseTransaction', ApproveNectarReleaseTransaction(
+        '0x0000000000000000000000000000000000000001', '2000000000000000000', '0x' + 'a' * 64, '0x' + 'b' * 64, '0x1')
+    for size in SIZES:
+        yield f'CustomTransaction[{size}]', CustomTransaction(**{f'key-{i}': f'value-{i}' for i in range(size)})
+
+
+class KnownSenderTransaction(SignedTransaction):
+    """
+    Verified against the public key of PRIVATE_KEY rather than recovering the sender
+    """
+    __slots__ = ()
+    key_directory = KeyDirectory()
+
+
+KnownSenderTransaction.key_directory.add(Signer(PRIVATE_KEY).public_key)
+
+
+def benchmarks() -> Iterator[Benchmark]:
+    for name, transaction in transactions():
+        signed = transaction.sign(PRIVATE_KEY)
+        raw_transaction, signature = signed.raw_transaction, bytes(signed.signature)
+
+        yield Benchmark(f'sign:{name}', lambda transaction=transaction: transaction.sign(PRIVATE_KEY))
+        # Fresh instances, SignedTransaction memoizes the hash and parsed body
+        yield Benchmark(f'ecrecover:{name}',
+                        lambda raw=raw_transaction, sig=signature: SignedTransaction(raw, sig).ecrecover())
+        yield Benchmark(f'ecrecover:known_sender:{name}',
+                        lambda raw=raw_transaction, sig=signature: KnownSenderTransaction(raw, sig).ecrecover())
+        yield Benchmark(f'transaction:{name}',
+                        lambda raw=raw_transaction, sig=signature: SignedTransaction(raw, sig).transaction())
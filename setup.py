@@ -27,6 +27,10 @@ setup(
         "web3~=5.6.0",
         "click~=7.1.2",
     ],
+    extras_require={
+        "orjson": ["orjson"],
+        "coincurve": ["coincurve"],
+    },
     include_package_data=True,
     packages=find_packages('src'),
     package_dir={'': 'src'},
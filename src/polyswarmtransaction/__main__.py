@@ -1,27 +1,189 @@
+import collections
 import getpass
 import json
+import time
 
 import click
-from web3.auto import w3
 
-from .transaction import CustomTransaction, HexBytes
+from .daemon import SigningClient, SigningServer
+from .exceptions import WrongPayloadError
+from .transaction import CustomTransaction, HexBytes, Signer, transaction_name
 
 
-@click.command()
+class DefaultCommandGroup(click.Group):
+    """
+    Group falling back to `default_command` when the first argument is not a command,
+    so `python -m polyswarmtransaction KEYFILE` keeps signing
+    """
+    def __init__(self, *args, default_command: str, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.default_command = default_command
+
+    def parse_args(self, ctx, args):
+        if args and args[0] not in self.commands and args[0] not in self.get_help_option_names(ctx):
+            args.insert(0, self.default_command)
+        return super().parse_args(ctx, args)
+
+
+def decrypt_key(keyfile, password: str) -> HexBytes:
+    # eth_account is only needed to decrypt, and multiprocessing to sign or verify in parallel: both are imported
+    # by the commands using them, keeping the others quick to start
+    from eth_account import Account
+
+    return Account.decrypt(keyfile.read(), password)
+
+
+@click.group(cls=DefaultCommandGroup, default_command='sign')
+def main():
+    """
+    Sign and verify PolySwarm transactions. Runs `sign` when no command is given.
+    """
+
+
+@main.command()
 @click.argument('keyfile', type=click.File())
 @click.option('--payload', type=click.File(mode='rb'), default='-', show_default=True)
 @click.option('--password', '-p')
-def main(payload, keyfile, password):
+@click.option('--stream', is_flag=True, help='Sign each line of `payload` as a separate JSON payload')
+@click.option('--workers', '-w', type=click.IntRange(min=1), default=1, show_default=True,
+              help='Number of processes signing in parallel when streaming')
+def sign(payload, keyfile, password, stream, workers):
     """
     Sign the `payload` (defaults to STDIN) using private key contained on `keyfile`
     decriptable with `password`.
 
     `password` will be prompted on tty if not provided via --password option
+
+    With --stream, `payload` is read as newline-delimited JSON and one signed payload is written per line,
+    decrypting `keyfile` only once.
+    """
+    private_key = decrypt_key(keyfile, password or getpass.getpass())
+    if not stream:
+        transaction = CustomTransaction(data_body=payload.read())
+        signed = transaction.sign(private_key)
+        click.echo(json.dumps(signed.payload))
+        return
+
+    transactions = (CustomTransaction(data_body=line) for line in payload if line.strip())
+    try:
+        if workers == 1:
+            signer = Signer(private_key)
+            for transaction in transactions:
+                click.echo(json.dumps(signer.sign(transaction).payload))
+        else:
+            from .parallel import SigningPool
+
+            with SigningPool(private_key, workers) as pool:
+                for signed in pool.imap(transactions):
+                    click.echo(json.dumps(signed.payload))
+    except json.JSONDecodeError as e:
+        raise click.ClickException(f'Payload is not valid JSON: {e}')
+
+
+@main.command()
+@click.argument('keyfile', type=click.File())
+@click.option('--socket', 'socket_path', type=click.Path(dir_okay=False), required=True,
+              help='Unix socket to listen on, only accessible to the current user')
+@click.option('--password', '-p')
+def daemon(keyfile, socket_path, password):
     """
-    private_key: HexBytes = web3.eth.account.decrypt(keyfile.read(), password or getpass.getpass())
-    transaction = CustomTransaction(data_body=payload.read())
-    signed = transaction.sign(private_key)
-    click.echo(json.dumps(signed.payload))
+    Decrypt the private key in `keyfile` once, then sign the payloads sent over `socket` until interrupted.
+
+    Use the `client` command, or `polyswarmtransaction.daemon.SigningClient`, to sign through it.
+    """
+    private_key = decrypt_key(keyfile, password or getpass.getpass())
+    try:
+        server = SigningServer(socket_path, Signer(private_key))
+    except FileExistsError as e:
+        raise click.ClickException(str(e))
+
+    click.echo(f'Signing on {socket_path}', err=True)
+    with server:
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+@main.command()
+@click.option('--socket', 'socket_path', type=click.Path(dir_okay=False), required=True,
+              help='Unix socket of the signing daemon')
+@click.option('--payload', type=click.File(mode='rb'), default='-', show_default=True)
+@click.option('--stream', is_flag=True, help='Sign each line of `payload` as a separate JSON payload')
+def client(socket_path, payload, stream):
+    """
+    Sign the `payload` (defaults to STDIN) through the signing daemon listening on `socket`,
+    writing the same output as `sign`
+    """
+    try:
+        signing_client = SigningClient(socket_path)
+    except OSError as e:
+        raise click.ClickException(f'Cannot connect to the signing daemon on {socket_path}: {e}')
+
+    with signing_client:
+        try:
+            if not stream:
+                click.echo(json.dumps(signing_client.sign(payload.read()).payload))
+                return
+
+            for signed in signing_client.sign_many(line for line in payload if line.strip()):
+                click.echo(json.dumps(signed.payload))
+        except WrongPayloadError as e:
+            raise click.ClickException(f'Payload could not be signed: {e}')
+
+
+@main.command()
+@click.option('--input', 'input_', type=click.File(mode='rb'), default='-', show_default=True,
+              help='Newline-delimited JSON of signed payloads')
+@click.option('--output', type=click.File(mode='w'), default='-', show_default=True)
+@click.option('--workers', '-w', type=click.IntRange(min=1), help='Number of verifying processes [default: CPUs]')
+@click.option('--chunksize', type=click.IntRange(min=1), default=256, show_default=True)
+def verify(input_, output, workers, chunksize):
+    """
+    Verify every signed payload in `input` (defaults to STDIN), one JSON payload per line.
+
+    Writes one result per line: the recovered address and transaction name, or the error class,
+    followed by a summary on STDERR.
+    """
+    from .parallel import VerificationPool
+
+    counts = collections.Counter()
+    # Line numbers of the payloads in flight, results come back in the same order
+    line_numbers = collections.deque()
+    size = 0
+
+    def lines():
+        nonlocal size
+        for line_number, line in enumerate(input_, start=1):
+            size += len(line)
+            if line.strip():
+                line_numbers.append(line_number)
+                yield line
+
+    start = time.perf_counter()
+    with VerificationPool(workers) as pool:
+        for result in pool.imap(lines(), chunksize):
+            line_number = line_numbers.popleft()
+            if result.ok:
+                counts['ok'] += 1
+                record = {'line': line_number, 'address': result.address,
+                          'name': transaction_name(result.transaction.__class__)}
+            else:
+                counts[result.error.__class__.__name__] += 1
+                record = {'line': line_number, 'error': result.error.__class__.__name__, 'message': str(result.error)}
+            output.write(json.dumps(record) + '\n')
+
+    elapsed = time.perf_counter() - start
+    total = sum(counts.values())
+    summary = {
+        'total': total,
+        'valid': counts.pop('ok', 0),
+        'errors': dict(counts),
+        'seconds': round(elapsed, 3),
+        'payloads_per_second': round(total / elapsed, 1) if elapsed else None,
+        'megabytes_per_second': round(size / elapsed / 1e6, 3) if elapsed else None,
+    }
+    click.echo(json.dumps(summary), err=True)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,127 @@
+import collections
+import re
+import threading
+
+from typing import Iterable, Optional, Tuple
+
+from polyswarmtransaction import exceptions
+from polyswarmtransaction.transaction import SIGNATURE_SIZE, TRANSACTION_SCHEMA, SignedTransaction
+
+# Order of the secp256k1 group, r and s of a signature must be in [1, N)
+SECP256K1_N = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEBAAEDCE6AF48A03BBFD25E8CD0364141
+DEFAULT_MAX_SIZE = 1024 * 1024
+
+NAME_PATTERN = re.compile(TRANSACTION_SCHEMA['properties']['name']['pattern'])
+# Head of the messages written by `Signer`, read without parsing the rest. Printable ASCII only, strings holding
+# escapes or anything else are left to the JSON parser.
+_HEAD = re.compile(r'\{"name": "([\x20\x21\x23-\x5b\x5d-\x7e]*)", "from": "([\x20\x21\x23-\x5b\x5d-\x7e]*)", "data": ')
+_BYTES_HEAD = re.compile(_HEAD.pattern.encode())
+# Parsers keep the last of duplicate keys, the head only holds when no other name or from key, escaped or not, may
+# follow it. Searched apart, a single pattern with both is several times slower.
+_TAIL_KEY = re.compile(r'"(?:name|from)"')
+_BYTES_TAIL_KEY = re.compile(_TAIL_KEY.pattern.encode())
+_ESCAPE = re.compile(r'\\')
+_BYTES_ESCAPE = re.compile(_ESCAPE.pattern.encode())
+
+
+class AdmissionFilter:
+    """
+    Cheap checks on signed transactions, run before any hashing or EC recovery to shed junk traffic.
+
+    Rejects messages over `max_size` (characters for str, bytes otherwise), signatures that can never be valid,
+    names not matching the transaction schema or starting with none of `name_prefixes`, and senders missing from
+    `allowed_senders` or listed in `denied_senders`. Each check raises its own `AdmissionError`, counted in `rejects`
+    by exception name.
+
+    Name and sender are only read when one of their checks is set, from the head of the message when written by
+    `Signer`, parsing it otherwise.
+    """
+    def __init__(self, max_size: Optional[int] = DEFAULT_MAX_SIZE, name_prefixes: Optional[Iterable[str]] = None,
+                 allowed_senders: Optional[Iterable[str]] = None, denied_senders: Optional[Iterable[str]] = None):
+        self.max_size = max_size
+        self.name_prefixes = None if name_prefixes is None else tuple(name_prefixes)
+        # Addresses are compared case insensitively, whether checksummed or not
+        self.allowed_senders = None if allowed_senders is None else frozenset(a.lower() for a in allowed_senders)
+        self.denied_senders = frozenset(address.lower() for address in denied_senders or ())
+        self.admitted = 0
+        self.rejects = collections.Counter()
+        self.__lock = threading.Lock()
+
+    @property
+    def reads_head(self) -> bool:
+        return self.name_prefixes is not None or self.allowed_senders is not None or bool(self.denied_senders)
+
+    def check(self, signed: SignedTransaction):
+        """
+        Raise an `AdmissionError` when `signed` is rejected
+        """
+        try:
+            self.__check(signed)
+        except exceptions.AdmissionError as e:
+            with self.__lock:
+                self.rejects[e.__class__.__name__] += 1
+            raise
+
+        with self.__lock:
+            self.admitted += 1
+
+    def clear(self):
+        with self.__lock:
+            self.admitted = 0
+            self.rejects.clear()
+
+    def __check(self, signed: SignedTransaction):
+        size = len(signed.raw_transaction)
+        if self.max_size is not None and size > self.max_size:
+            raise exceptions.OversizedTransactionError(f'Transaction of {size} bytes is over {self.max_size}')
+
+        check_signature(signed.signature_bytes)
+        if not self.reads_head:
+            return
+
+        name, sender = read_head(signed)
+        if not NAME_PATTERN.match(name) or (self.name_prefixes is not None and not name.startswith(self.name_prefixes)):
+            raise exceptions.DisallowedTransactionError(f'{name} is not an allowed transaction')
+
+        address = sender.lower()
+        if address in self.denied_senders or (self.allowed_senders is not None and address not in self.allowed_senders):
+            raise exceptions.DisallowedSenderError(f'{sender} is not an allowed sender')
+
+
+def check_signature(signature: bytes):
+    """
+    Raise MalformedSignatureError unless `signature` is 65 bytes, with r and s in range and a recovery id of 0 or 1
+    """
+    if len(signature) != SIGNATURE_SIZE or signature[64] > 1:
+        raise exceptions.MalformedSignatureError(f'{signature.hex()} is not a valid signature')
+
+    r = int.from_bytes(signature[:32], 'big')
+    s = int.from_bytes(signature[32:64], 'big')
+    if not 0 < r < SECP256K1_N or not 0 < s < SECP256K1_N:
+        raise exceptions.MalformedSignatureError(f'{signature.hex()} is out of the curve order')
+
+
+def read_head(signed: SignedTransaction) -> Tuple[str, str]:
+    """
+    Name and claimed sender of `signed`, read from the head of the message when nothing after it can override them,
+    or from its parsed body
+    """
+    raw_transaction = signed.raw_transaction
+    head, tail_key, escape = (_HEAD, _TAIL_KEY, _ESCAPE) if isinstance(raw_transaction, str) else \
+        (_BYTES_HEAD, _BYTES_TAIL_KEY, _BYTES_ESCAPE)
+    match = head.match(raw_transaction)
+    if match is not None and tail_key.search(raw_transaction, match.end()) is None and \
+            escape.search(raw_transaction, match.end()) is None:
+        name, sender = match.groups()
+        return (name, sender) if isinstance(name, str) else (name.decode(), sender.decode())
+
+    try:
+        body = signed.body
+    except ValueError as e:
+        # json.JSONDecodeError and UnicodeDecodeError are ValueErrors
+        raise exceptions.MalformedTransactionError(f'Transaction is not valid JSON: {e}')
+
+    name, sender = (body.get('name'), body.get('from')) if isinstance(body, dict) else (None, None)
+    if not isinstance(name, str) or not isinstance(sender, str):
+        raise exceptions.MalformedTransactionError('Transaction has no name or sender')
+    return name, sender
@@ -0,0 +1,76 @@
+import asyncio
+import os
+
+from concurrent.futures import Executor
+from typing import Iterable, List, Optional, Tuple
+
+from polyswarmtransaction.parallel import Payload, VerificationResult, verify_chunk
+
+
+class AsyncVerifier:
+    """
+    Verifies payloads for asyncio code without blocking the event loop.
+
+    Payloads arriving together are grouped in micro-batches of up to `max_batch_size`, waiting at most
+    `max_batch_delay` seconds for a batch to fill. Each batch is verified on `executor` (the loop default
+    executor when None), with at most `max_concurrency` batches in flight; later batches wait their turn.
+    """
+    def __init__(self, executor: Optional[Executor] = None, max_batch_size: int = 64, max_batch_delay: float = 0.001,
+                 max_concurrency: Optional[int] = None):
+        self.executor = executor
+        self.max_batch_size = max_batch_size
+        self.max_batch_delay = max_batch_delay
+        self.max_concurrency = max_concurrency or os.cpu_count() or 1
+        self.__pending: List[Tuple[Payload, asyncio.Future]] = []
+        self.__timer: Optional[asyncio.TimerHandle] = None
+        self.__semaphore: Optional[asyncio.Semaphore] = None
+
+    async def verify(self, payload: Payload) -> VerificationResult:
+        loop = asyncio.get_event_loop()
+        future = loop.create_future()
+        self.__pending.append((payload, future))
+        if len(self.__pending) >= self.max_batch_size:
+            self.__flush()
+        elif self.__timer is None:
+            self.__timer = loop.call_later(self.max_batch_delay, self.__flush)
+
+        return await future
+
+    async def verify_many(self, payloads: Iterable[Payload]) -> List[VerificationResult]:
+        return await asyncio.gather(*(self.verify(payload) for payload in payloads))
+
+    def __flush(self):
+        if self.__timer is not None:
+            self.__timer.cancel()
+            self.__timer = None
+
+        batch, self.__pending = self.__pending, []
+        if batch:
+            asyncio.ensure_future(self.__run(batch))
+
+    async def __run(self, batch: List[Tuple[Payload, asyncio.Future]]):
+        if self.__semaphore is None:
+            # Created lazily so it binds to the running loop
+            self.__semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async with self.__semaphore:
+            try:
+                loop = asyncio.get_event_loop()
+                results = await loop.run_in_executor(self.executor, verify_chunk, [payload for payload, _ in batch])
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                return
+
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+
+async def averify_many(payloads: Iterable[Payload], executor: Optional[Executor] = None,
+                       max_batch_size: int = 64) -> List[VerificationResult]:
+    """
+    Verify every payload on `executor` in batches, returning one `VerificationResult` per payload in input order
+    """
+    return await AsyncVerifier(executor, max_batch_size=max_batch_size).verify_many(payloads)
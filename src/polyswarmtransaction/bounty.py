@@ -1,15 +1,116 @@
-from typing import Dict, Any, List
+import contextlib
+import threading
+
+from typing import Any, ClassVar, Dict, Hashable, Iterator, List, Optional, Type
 from uuid import uuid4
 
 import dataclasses
 from polyswarmartifact import ArtifactType
+from polyswarmartifact.schema.schema import Schema
+from polyswarmtransaction.cache import MetadataCache
 from polyswarmtransaction.transaction import Transaction
 from polyswarmartifact.schema.bounty import Bounty as BountyMetadata
 from polyswarmartifact.schema.verdict import Verdict as VerdictMetadata
 
+# Shared cache of metadata validation results, None validates every time
+metadata_cache: Optional[MetadataCache] = MetadataCache()
+
+_deferred = threading.local()
+
+
+def validate_metadata(schema: Type[Schema], metadata: Any) -> bool:
+    """
+    Validate `metadata` against `schema`, through `metadata_cache` when set
+    """
+    if metadata_cache is None:
+        return bool(schema.validate(metadata))
+    return _validate_metadata(schema, metadata, _metadata_key(schema, metadata))
+
+
+def _metadata_key(schema: Type[Schema], metadata: Any) -> Optional[Hashable]:
+    try:
+        return MetadataCache.key(schema, metadata)
+    except (TypeError, ValueError):
+        # Not JSON serializable, left to the schema to reject
+        return None
+
+
+def _validate_metadata(schema: Type[Schema], metadata: Any, key: Optional[Hashable]) -> bool:
+    cache = metadata_cache
+    if cache is None or key is None:
+        return bool(schema.validate(metadata))
+
+    valid = cache.get(key)
+    if valid is None:
+        valid = bool(schema.validate(metadata))
+        cache.put(key, valid)
+    return valid
+
+
+class DeferredValidation:
+    """
+    Transactions built inside `deferred_validation()`, their metadata validated together when it ends
+    """
+    def __init__(self):
+        self.pending: List[Transaction] = []
+        self.invalid: List[Transaction] = []
+
+    def validate(self) -> List[Transaction]:
+        """
+        Validate every pending transaction, each distinct metadata only once, and return the invalid ones
+        """
+        results: Dict[Hashable, bool] = {}
+        for transaction in self.pending:
+            schema, metadata = transaction.metadata_schema, transaction.metadata
+            key = _metadata_key(schema, metadata)
+            if key is None:
+                valid = _validate_metadata(schema, metadata, key)
+            else:
+                try:
+                    valid = results[key]
+                except KeyError:
+                    valid = results[key] = _validate_metadata(schema, metadata, key)
+
+            if not valid:
+                self.invalid.append(transaction)
+
+        self.pending = []
+        return self.invalid
+
+
+@contextlib.contextmanager
+def deferred_validation() -> Iterator[DeferredValidation]:
+    """
+    Defer the metadata validation of bounties and assertions built in this thread to the end of the block,
+    raising ValueError then if any is invalid. `DeferredValidation.invalid` lists them.
+    """
+    previous = getattr(_deferred, 'batch', None)
+    batch = _deferred.batch = DeferredValidation()
+    try:
+        yield batch
+    finally:
+        _deferred.batch = previous
+
+    if batch.validate():
+        raise ValueError(f'{len(batch.invalid)} transactions have invalid metadata')
+
+
+def check_metadata(transaction: Transaction):
+    """
+    Raise ValueError unless the metadata of `transaction` matches its `metadata_schema`,
+    or queue it when validation is deferred
+    """
+    batch = getattr(_deferred, 'batch', None)
+    if batch is not None:
+        batch.pending.append(transaction)
+    elif not validate_metadata(transaction.metadata_schema, transaction.metadata):
+        raise ValueError
+
 
 @dataclasses.dataclass
 class BountyTransaction(Transaction):
+    __slots__ = ('guid', 'reward', 'artifact', 'artifact_type', 'duration', 'metadata')
+    metadata_schema: ClassVar[Type[Schema]] = BountyMetadata
     guid: uuid4
     reward: str
     artifact: str
@@ -18,8 +119,7 @@ class BountyTransaction(Transaction):
     metadata: List[Dict[str, Any]]
 
     def __post_init__(self):
-        if not BountyMetadata.validate(self.metadata):
-            raise ValueError
+        check_metadata(self)
 
         if not ArtifactType(self.artifact_type):
             raise ValueError
@@ -27,19 +127,19 @@ class BountyTransaction(Transaction):
 
 @dataclasses.dataclass
 class AssertionTransaction(Transaction):
+    __slots__ = ('guid', 'verdict', 'bid', 'metadata')
+    metadata_schema: ClassVar[Type[Schema]] = VerdictMetadata
     guid: uuid4
     verdict: bool
     bid: str
     metadata: Dict[str, Any]
 
     def __post_init__(self):
-        if not VerdictMetadata.validate(self.metadata):
-            raise ValueError
+        check_metadata(self)
 
 
 @dataclasses.dataclass
 class VoteTransaction(Transaction):
+    __slots__ = ('guid', 'vote')
     guid: uuid4
     vote: bool
-
-
@@ -0,0 +1,131 @@
+import collections
+import hashlib
+import threading
+
+from typing import TYPE_CHECKING, Any, Hashable, Optional, Tuple
+
+from polyswarmtransaction import codec
+
+if TYPE_CHECKING:
+    from eth_keys.datatypes import PublicKey
+
+
+class LRUCache:
+    """
+    Thread safe mapping holding at most `maxsize` entries, evicting the least recently used first.
+
+    Keeps hit, miss and eviction counts to tune `maxsize` against.
+    """
+    def __init__(self, maxsize: int = 4096):
+        if maxsize < 1:
+            raise ValueError('maxsize must be at least 1')
+
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.__entries = collections.OrderedDict()
+        self.__lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.__entries
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self.__lock:
+            try:
+                value = self.__entries[key]
+            except KeyError:
+                self.misses += 1
+                return default
+
+            self.__entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any):
+        with self.__lock:
+            self.__entries[key] = value
+            self.__entries.move_to_end(key)
+            if len(self.__entries) > self.maxsize:
+                self.__entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self.__lock:
+            self.__entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+
+class RecoveryCache(LRUCache):
+    """
+    Checksum addresses recovered from a signature, keyed by message hash and signature bytes.
+
+    Rebroadcast and retried transactions then cost a lookup instead of an EC recovery.
+    """
+    @staticmethod
+    def key(message_hash: bytes, signature: bytes) -> bytes:
+        return bytes(message_hash) + bytes(signature)
+
+    def get_address(self, message_hash: bytes, signature: bytes) -> Optional[str]:
+        return self.get(self.key(message_hash, signature))
+
+    def put_address(self, message_hash: bytes, signature: bytes, address: str):
+        self.put(self.key(message_hash, signature), address)
+
+
+class KeyDirectory(LRUCache):
+    """
+    Public keys of known senders along with their checksum address, keyed by raw 20 bytes address.
+
+    Filled with the senders recovered by `SignedTransaction`, or preloaded with `add()`. Transactions from a known
+    sender are then checked against its key with `transaction.verify_signer()`, skipping address derivation, and
+    recovery with the native backend. Signatures are accepted exactly when recovery gives that key.
+    """
+    @staticmethod
+    def key(address: Any) -> Optional[bytes]:
+        """
+        Raw bytes of hex `address`, None when it is not an address
+        """
+        if not isinstance(address, str) or len(address) != 42 or not address.startswith('0x'):
+            return None
+        try:
+            return bytes.fromhex(address[2:])
+        except ValueError:
+            return None
+
+    def add(self, public_key: 'PublicKey', address: Optional[str] = None):
+        """
+        Add `public_key`, whose checksum `address` is derived when not given
+        """
+        if address is None:
+            address = public_key.to_checksum_address()
+        self.put(self.key(address), (public_key, address))
+
+    def get_key(self, address: Any) -> Optional[Tuple['PublicKey', str]]:
+        """
+        Public key and checksum address of sender `address`, None when unknown
+        """
+        key = self.key(address)
+        return None if key is None else self.get(key)
+
+
+class MetadataCache(LRUCache):
+    """
+    Metadata validation results, keyed by schema and a digest of the metadata JSON.
+
+    Engines repeat the same metadata, identical scanner blocks for instance, which then skip validation.
+    """
+    @staticmethod
+    def key(schema: type, metadata: Any) -> Tuple[type, bytes]:
+        """
+        Raises TypeError when `metadata` is not JSON serializable
+        """
+        return schema, hashlib.blake2b(codec.dumps(metadata).encode()).digest()
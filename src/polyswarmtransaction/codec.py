@@ -0,0 +1,95 @@
+import json
+import re
+
+from typing import Any, Dict, List, Optional, Type, Union
+
+from polyswarmtransaction.hashing import Buffer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Numbers with that many digits may not fit 64 bits, see OrjsonBackend
+_LONG_NUMBER = re.compile('[0-9]{19}')
+# Searching buffers without copying them, bytes patterns accept any bytes-like object
+_LONG_NUMBER_BYTES = re.compile(b'[0-9]{19}')
+
+
+class JSONBackend:
+    """
+    Standard library json, the reference every backend must match
+    """
+    name = 'json'
+
+    @staticmethod
+    def loads(data: Union[str, Buffer]) -> Any:
+        if isinstance(data, (bytearray, memoryview)):
+            # json only parses str and bytes
+            data = bytes(data)
+        return json.loads(data)
+
+
+class OrjsonBackend(JSONBackend):
+    """
+    orjson parser, falling back to the standard library for any input it would not load the same way.
+
+    orjson turns integers over 64 bits into floats, and rejects NaN, Infinity and lone surrogates that json accepts.
+    Inputs holding a run of 19 digits or more, or that orjson rejects, are therefore loaded by json instead.
+    """
+    name = 'orjson'
+
+    @staticmethod
+    def loads(data: Union[str, Buffer]) -> Any:
+        if (_LONG_NUMBER if isinstance(data, str) else _LONG_NUMBER_BYTES).search(data) is not None:
+            return JSONBackend.loads(data)
+
+        try:
+            # Parses str, bytes, bytearray and memoryview as given, without copying them
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # Either invalid, and json raises the usual error, or only understood by json
+            return JSONBackend.loads(data)
+
+
+BACKENDS: Dict[str, Type[JSONBackend]] = {JSONBackend.name: JSONBackend}
+if orjson is not None:
+    BACKENDS[OrjsonBackend.name] = OrjsonBackend
+
+_backend: Type[JSONBackend] = JSONBackend
+
+
+def available_backends() -> List[str]:
+    return list(BACKENDS)
+
+
+def get_backend() -> Type[JSONBackend]:
+    return _backend
+
+
+def set_backend(name: Optional[str] = None):
+    """
+    Load JSON with backend `name`, or the fastest one installed when None
+    """
+    global _backend
+    if name is None:
+        name = OrjsonBackend.name if OrjsonBackend.name in BACKENDS else JSONBackend.name
+
+    try:
+        _backend = BACKENDS[name]
+    except KeyError:
+        raise ValueError(f'Unknown JSON backend {name}, available: {", ".join(BACKENDS)}')
+
+
+def loads(data: Union[str, Buffer]) -> Any:
+    return _backend.loads(data)
+
+
+def dumps(obj: Any) -> str:
+    """
+    Canonical JSON, as signed. Always the standard library json.dumps format, whatever the backend.
+    """
+    return json.dumps(obj)
+
+
+set_backend()
@@ -0,0 +1,162 @@
+import collections
+import os
+import socket
+import socketserver
+import stat
+
+from typing import Iterable, Iterator, Union
+
+from polyswarmtransaction import exceptions
+from polyswarmtransaction.framing import MAX_FRAME_SIZE, FrameReader, pack_frame
+from polyswarmtransaction.transaction import CustomTransaction, SignedTransaction, Signer
+
+# Requests are frames holding a JSON payload, signed as a CustomTransaction like `python -m polyswarmtransaction`.
+# Responses come back in request order: OK and the binary encoded SignedTransaction, or ERROR and a UTF-8 message.
+OK = b'\x00'
+ERROR = b'\x01'
+
+# Pipelining limits. Keeping in flight less than the socket buffers hold, the server never blocks on a client
+# that is itself blocked sending.
+DEFAULT_WINDOW = 64
+DEFAULT_WINDOW_BYTES = 64 * 1024
+
+
+class SigningHandler(socketserver.StreamRequestHandler):
+    """
+    Answers the pipelined requests of one client, in order
+    """
+    def handle(self):
+        reader = FrameReader(self.rfile, self.server.max_frame_size)
+        while True:
+            try:
+                frame = reader.read_frame()
+            except exceptions.InvalidFrameError:
+                # Framing is lost, nothing after it can be trusted
+                return
+            if frame is None:
+                return
+            # Unbuffered, each response is sent as soon as it is signed
+            self.wfile.write(pack_frame(self.server.sign_frame(frame)))
+
+
+class SigningServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    Signs payloads sent over the Unix socket at `path` with `signer`, one thread per client.
+
+    The socket is only accessible to the user running the server, anyone able to connect can sign.
+    """
+    daemon_threads = True
+
+    def __init__(self, path: str, signer: Signer, max_frame_size: int = MAX_FRAME_SIZE):
+        self.signer = signer
+        self.max_frame_size = max_frame_size
+        remove_stale_socket(path)
+        super().__init__(path, SigningHandler)
+
+    def server_bind(self):
+        # Created with owner only permissions, there is no window where others could connect
+        umask = os.umask(0o177)
+        try:
+            super().server_bind()
+        finally:
+            os.umask(umask)
+
+    def server_close(self):
+        super().server_close()
+        try:
+            os.unlink(self.server_address)
+        except FileNotFoundError:
+            pass
+
+    def sign_frame(self, frame: bytes) -> bytes:
+        try:
+            signed = self.signer.sign(CustomTransaction(data_body=str(frame, 'utf-8')))
+            return OK + signed.encode()
+        except Exception as e:
+            # Report any failure to the client rather than dropping its connection
+            return ERROR + f'{e.__class__.__name__}: {e}'.encode()
+
+
+def remove_stale_socket(path: str):
+    """
+    Remove the socket left at `path` by a server that is gone, refusing to take over a running one
+    """
+    try:
+        mode = os.stat(path).st_mode
+    except FileNotFoundError:
+        return
+
+    if not stat.S_ISSOCK(mode):
+        raise FileExistsError(f'{path} exists and is not a socket')
+
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except ConnectionRefusedError:
+        os.unlink(path)
+    else:
+        raise FileExistsError(f'A server is already listening on {path}')
+    finally:
+        probe.close()
+
+
+class SigningClient:
+    """
+    Client of a `SigningServer`, pipelining requests over a single connection
+    """
+    def __init__(self, path: str, max_frame_size: int = MAX_FRAME_SIZE):
+        self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.socket.connect(path)
+        self.reader = FrameReader(self.socket.makefile('rb'), max_frame_size)
+
+    def __enter__(self) -> 'SigningClient':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        self.reader.stream.close()
+        self.socket.close()
+
+    def sign(self, payload: Union[str, bytes]) -> SignedTransaction:
+        """
+        Sign JSON `payload`, raising WrongPayloadError when the server could not
+        """
+        self.send(payload)
+        return self.receive()
+
+    def sign_many(self, payloads: Iterable[Union[str, bytes]], window: int = DEFAULT_WINDOW,
+                  window_bytes: int = DEFAULT_WINDOW_BYTES) -> Iterator[SignedTransaction]:
+        """
+        Sign `payloads` in order, keeping up to `window` requests and `window_bytes` of payloads in flight
+        """
+        # Sizes of the requests in flight
+        in_flight = collections.deque()
+        in_flight_bytes = 0
+        for payload in payloads:
+            payload = payload.encode() if isinstance(payload, str) else payload
+            while in_flight and (len(in_flight) >= window or in_flight_bytes + len(payload) > window_bytes):
+                yield self.receive()
+                in_flight_bytes -= in_flight.popleft()
+
+            self.send(payload)
+            in_flight.append(len(payload))
+            in_flight_bytes += len(payload)
+
+        while in_flight:
+            yield self.receive()
+            in_flight.popleft()
+
+    def send(self, payload: Union[str, bytes]):
+        if isinstance(payload, str):
+            payload = payload.encode()
+        self.socket.sendall(pack_frame(payload))
+
+    def receive(self) -> SignedTransaction:
+        frame = self.reader.read_frame()
+        if not frame:
+            raise exceptions.InvalidFrameError('Signing server closed the connection')
+        if frame[:1] == ERROR:
+            raise exceptions.WrongPayloadError(str(frame[1:], 'utf-8', 'replace'))
+        return SignedTransaction.decode(memoryview(frame)[1:])
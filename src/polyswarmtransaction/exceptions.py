@@ -30,3 +30,54 @@ class MissingTransactionError(PolySwarmTransactionException):
 
 class UnsupportedTransactionError(PolySwarmTransactionException):
     pass
+
+
+class ReplayedTransactionError(PolySwarmTransactionException):
+    """
+    To be raised when a signed transaction was already seen
+    """
+    pass
+
+
+class InvalidFrameError(WrongPayloadError):
+    """
+    To be raised when binary encoded transactions or their frames are malformed
+    """
+    pass
+
+
+class SlowBackendError(PolySwarmTransactionException):
+    """
+    To be raised when only a slow ECC backend is available in production mode
+    """
+    pass
+
+
+class AdmissionError(PolySwarmTransactionException):
+    """
+    To be raised when a signed transaction is rejected by an admission filter, before any cryptography
+    """
+    pass
+
+
+class OversizedTransactionError(AdmissionError, WrongPayloadError):
+    pass
+
+
+class MalformedTransactionError(AdmissionError, WrongPayloadError):
+    """
+    To be raised when the name or sender of a signed transaction cannot be read
+    """
+    pass
+
+
+class MalformedSignatureError(AdmissionError, InvalidSignatureError):
+    pass
+
+
+class DisallowedTransactionError(AdmissionError, UnsupportedTransactionError):
+    pass
+
+
+class DisallowedSenderError(AdmissionError):
+    pass
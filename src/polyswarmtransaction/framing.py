@@ -0,0 +1,93 @@
+import struct
+
+from typing import BinaryIO, Iterable, Iterator, Optional
+
+from polyswarmtransaction import exceptions
+from polyswarmtransaction.hashing import Buffer
+from polyswarmtransaction.transaction import SignedTransaction
+
+# Every frame is preceded by its size, as a big endian unsigned 32 bits integer
+HEADER = struct.Struct('>I')
+MAX_FRAME_SIZE = 16 * 1024 * 1024
+
+
+def pack_frame(frame: Buffer) -> bytes:
+    return HEADER.pack(len(frame)) + frame
+
+
+class FrameWriter:
+    """
+    Writes length prefixed frames, binary encoded signed transactions by default, to a binary stream
+    """
+    def __init__(self, stream: BinaryIO):
+        self.stream = stream
+
+    def write_frame(self, frame: Buffer):
+        self.stream.write(HEADER.pack(len(frame)))
+        self.stream.write(frame)
+
+    def write(self, signed: SignedTransaction):
+        self.write_frame(signed.encode())
+
+    def write_many(self, transactions: Iterable[SignedTransaction]):
+        for signed in transactions:
+            self.write(signed)
+
+    def flush(self):
+        self.stream.flush()
+
+
+class FrameReader:
+    """
+    Reads length prefixed frames from a binary stream, iterating over the signed transactions they hold.
+
+    Frames larger than `max_frame_size` are rejected before reading them, so a corrupted size cannot exhaust memory.
+    """
+    def __init__(self, stream: BinaryIO, max_frame_size: int = MAX_FRAME_SIZE):
+        self.stream = stream
+        self.max_frame_size = max_frame_size
+
+    def __iter__(self) -> Iterator[SignedTransaction]:
+        while True:
+            signed = self.read()
+            if signed is None:
+                return
+            yield signed
+
+    def read(self) -> Optional[SignedTransaction]:
+        """
+        Next signed transaction, None at the end of the stream
+        """
+        frame = self.read_frame()
+        return SignedTransaction.decode(frame) if frame is not None else None
+
+    def read_frame(self) -> Optional[bytes]:
+        """
+        Next frame, None at the end of the stream
+        """
+        header = self.stream.read(HEADER.size)
+        if not header:
+            return None
+        if len(header) < HEADER.size:
+            header += self.__read_exactly(HEADER.size - len(header))
+
+        size, = HEADER.unpack(header)
+        if size > self.max_frame_size:
+            raise exceptions.InvalidFrameError(f'Frame of {size} bytes is over the {self.max_frame_size} bytes limit')
+        return self.__read_exactly(size)
+
+    def __read_exactly(self, size: int) -> bytes:
+        data = self.stream.read(size)
+        if len(data) == size:
+            return data
+
+        # Short reads happen on pipes and sockets
+        chunks = [data]
+        remaining = size - len(data)
+        while remaining:
+            chunk = self.stream.read(remaining)
+            if not chunk:
+                raise exceptions.InvalidFrameError(f'Stream ended {remaining} bytes before the end of the frame')
+            chunks.append(chunk)
+            remaining -= len(chunk)
+        return b''.join(chunks)
@@ -0,0 +1,69 @@
+import functools
+
+from typing import Any, Callable, Optional, Union
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+# Hash functions picked on first use, importing pycryptodome (or eth_hash) at package import costs tens of milliseconds
+_keccak: Optional[Callable[[Buffer], bytes]] = None
+# Builds incremental hashes, with `update(chunk)` and `digest()` methods
+_new_keccak: Optional[Callable[[], Any]] = None
+
+
+def keccak(data: Union[str, Buffer]) -> bytes:
+    """
+    keccak256 of `data`, hashing buffers in place. Strings are hashed as UTF-8, like `Web3.keccak(text=...)`.
+    """
+    if isinstance(data, str):
+        data = data.encode()
+    return (_keccak or load_keccak())(data)
+
+
+def new_keccak() -> Any:
+    """
+    Incremental keccak256: `update()` it with each chunk of the message, then get its `digest()`
+    """
+    if _new_keccak is None:
+        load_keccak()
+    return _new_keccak()
+
+
+def load_keccak() -> Callable[[Buffer], bytes]:
+    """
+    Pick the keccak256 implementation: pycryptodome, which hashes any buffer, or eth_hash
+    """
+    global _keccak, _new_keccak
+    try:
+        from Crypto.Hash import keccak as cryptodome_keccak
+    except ImportError:
+        _keccak = eth_hash_keccak
+        _new_keccak = BufferedKeccak
+    else:
+        def _cryptodome_keccak(data: Buffer) -> bytes:
+            return cryptodome_keccak.new(data=data, digest_bits=256).digest()
+
+        _keccak = _cryptodome_keccak
+        _new_keccak = functools.partial(cryptodome_keccak.new, digest_bits=256)
+    return _keccak
+
+
+def eth_hash_keccak(data: Buffer) -> bytes:
+    from eth_hash.auto import keccak as eth_keccak
+
+    # eth_hash only takes bytes and bytearray
+    return eth_keccak(data.tobytes() if isinstance(data, memoryview) else data)
+
+
+class BufferedKeccak:
+    """
+    Incremental interface over eth_hash, which cannot hash in chunks: they are kept until `digest()`
+    """
+    def __init__(self):
+        self.chunks = bytearray()
+
+    def update(self, data: Buffer) -> 'BufferedKeccak':
+        self.chunks += data
+        return self
+
+    def digest(self) -> bytes:
+        return eth_hash_keccak(self.chunks)
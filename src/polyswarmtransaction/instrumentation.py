@@ -0,0 +1,200 @@
+import collections
+import dataclasses
+import math
+import threading
+import time
+
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+SIGN = 'sign'
+VERIFY = 'verify'
+
+# Stages, in pipeline order
+ADMIT = 'admit'
+SERIALIZE = 'serialize'
+HASH = 'hash'
+SIGNATURE = 'signature'
+RECOVER = 'recover'
+PARSE = 'parse'
+VALIDATE = 'validate'
+LOOKUP = 'lookup'
+DECODE = 'decode'
+TOTAL = 'total'
+
+
+@dataclasses.dataclass
+class Event:
+    """
+    One instrumented sign or verify call.
+
+    `stages` maps each stage that ran to its duration in seconds, `name` is None when the call failed before the
+    transaction name was known, and `error` is the exception type name of a failed call.
+    """
+    operation: str
+    name: Optional[str]
+    size: int
+    stages: Dict[str, float]
+    duration: float
+    error: Optional[str] = None
+
+    @property
+    def outcome(self) -> str:
+        return self.error or 'ok'
+
+
+Sink = Callable[[Event], None]
+
+# Replaced rather than mutated so it is safe to read without a lock.
+# Checked before every sign and verify: nothing else is done when empty.
+sinks: Tuple[Sink, ...] = ()
+_sinks_lock = threading.Lock()
+
+
+def add_sink(sink: Sink):
+    """
+    Call `sink` with an `Event` after every sign and verify. Sinks run inline, they should be quick and never raise.
+    """
+    global sinks
+    with _sinks_lock:
+        sinks = sinks + (sink,)
+
+
+def remove_sink(sink: Sink):
+    global sinks
+    with _sinks_lock:
+        sinks = tuple(registered for registered in sinks if registered != sink)
+
+
+class Timer:
+    """
+    Times consecutive stages of one call, then sends the event to the registered sinks
+    """
+    __slots__ = ('operation', 'size', 'name', 'stages', 'start', 'last')
+
+    def __init__(self, operation: str, size: int):
+        self.operation = operation
+        self.size = size
+        self.name = None
+        self.stages = {}
+        self.start = self.last = time.perf_counter()
+
+    def lap(self, stage: str):
+        """
+        Record the time since the previous lap as `stage`
+        """
+        now = time.perf_counter()
+        self.stages[stage] = self.stages.get(stage, 0.0) + now - self.last
+        self.last = now
+
+    def finish(self, error: Optional[BaseException] = None):
+        event = Event(self.operation, self.name, self.size, self.stages, time.perf_counter() - self.start,
+                      error.__class__.__name__ if error is not None else None)
+        for sink in sinks:
+            sink(event)
+
+
+class Histogram:
+    """
+    Log-linear histogram: values land in buckets growing by `growth`, so percentiles are within that ratio.
+    Values below `minimum` share the first bucket.
+    """
+    def __init__(self, minimum: float = 1e-6, growth: float = 2 ** 0.125):
+        self.minimum = minimum
+        self.growth = growth
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.buckets: Dict[int, int] = collections.defaultdict(int)
+        self.__log_growth = math.log(growth)
+
+    def add(self, value: float):
+        index = math.ceil(math.log(value / self.minimum) / self.__log_growth) if value > self.minimum else 0
+        self.buckets[index] += 1
+        self.count += 1
+        self.sum += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+    def percentile(self, fraction: float) -> float:
+        """
+        Upper bound of the bucket holding the `fraction` percentile, 0.99 being p99
+        """
+        if not self.count:
+            return 0.0
+
+        rank = max(1, math.ceil(fraction * self.count))
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(max(self.minimum * self.growth ** index, self.min), self.max)
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            'count': self.count,
+            'mean': self.mean,
+            'min': self.min if self.count else 0.0,
+            'p50': self.percentile(0.5),
+            'p90': self.percentile(0.9),
+            'p99': self.percentile(0.99),
+            'max': self.max if self.count else 0.0,
+        }
+
+
+class HistogramAggregator:
+    """
+    Sink keeping a duration histogram per operation, transaction name and stage (plus `total`),
+    a payload size histogram per operation and transaction name, and outcome counts.
+
+    >>> aggregator = HistogramAggregator()
+    >>> add_sink(aggregator)
+    """
+    def __init__(self):
+        self.durations: Dict[Tuple[str, Optional[str], str], Histogram] = {}
+        self.sizes: Dict[Tuple[str, Optional[str]], Histogram] = {}
+        self.outcomes: Dict[Tuple[str, Optional[str], str], int] = collections.Counter()
+        self.__lock = threading.Lock()
+
+    def __call__(self, event: Event):
+        key = (event.operation, event.name)
+        with self.__lock:
+            for stage, duration in event.stages.items():
+                self.__histogram(self.durations, key + (stage,)).add(duration)
+            self.__histogram(self.durations, key + (TOTAL,)).add(event.duration)
+            self.__histogram(self.sizes, key, minimum=1).add(event.size)
+            self.outcomes[key + (event.outcome,)] += 1
+
+    @staticmethod
+    def __histogram(histograms: Dict[Hashable, Histogram], key: Hashable, **kwargs) -> Histogram:
+        try:
+            return histograms[key]
+        except KeyError:
+            histogram = histograms[key] = Histogram(**kwargs)
+            return histogram
+
+    def clear(self):
+        with self.__lock:
+            self.durations.clear()
+            self.sizes.clear()
+            self.outcomes.clear()
+
+    def summary(self) -> List[Dict]:
+        """
+        One JSON serializable entry per operation and transaction name
+        """
+        with self.__lock:
+            entries = {}
+            for (operation, name, stage), histogram in self.durations.items():
+                entry = entries.setdefault((operation, name), {'operation': operation, 'name': name, 'stages': {}})
+                entry['stages'][stage] = histogram.summary()
+            for (operation, name), histogram in self.sizes.items():
+                entries[(operation, name)]['size'] = histogram.summary()
+            for (operation, name, outcome), count in self.outcomes.items():
+                entries[(operation, name)].setdefault('outcomes', {})[outcome] = count
+            return list(entries.values())
@@ -0,0 +1,91 @@
+from typing import List, Sequence, Union
+
+from polyswarmtransaction.hashing import Buffer, keccak
+
+# Domain separation: leaves, inner nodes and signed roots can never be mistaken for each other,
+# nor a signed root for the hash of a single transaction message, which starts with '{'
+LEAF_PREFIX = b'\x00'
+NODE_PREFIX = b'\x01'
+ROOT_PREFIX = b'\x02polyswarmtransaction batch root'
+
+HASH_SIZE = 32
+
+
+def leaf_hash(message: Union[str, Buffer]) -> bytes:
+    if isinstance(message, str):
+        message = message.encode()
+    return keccak(LEAF_PREFIX + message)
+
+
+def node_hash(left: bytes, right: bytes) -> bytes:
+    return keccak(NODE_PREFIX + left + right)
+
+
+def root_digest(root: bytes, size: int) -> bytes:
+    """
+    Hash signed for a batch of `size` transactions, binding the batch size along with the root
+    """
+    return keccak(ROOT_PREFIX + size.to_bytes(4, 'big') + root)
+
+
+class MerkleTree:
+    """
+    Binary Merkle tree over `leaves`. A node without sibling is carried up to the next level unchanged,
+    rather than paired with itself.
+    """
+    def __init__(self, leaves: Sequence[bytes]):
+        if not leaves:
+            raise ValueError('A Merkle tree needs at least one leaf')
+
+        self.levels: List[List[bytes]] = [list(leaves)]
+        while len(self.levels[-1]) > 1:
+            level = self.levels[-1]
+            parents = [node_hash(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)]
+            if len(level) % 2:
+                parents.append(level[-1])
+            self.levels.append(parents)
+
+    @property
+    def root(self) -> bytes:
+        return self.levels[-1][0]
+
+    @property
+    def size(self) -> int:
+        return len(self.levels[0])
+
+    def proof(self, index: int) -> List[bytes]:
+        """
+        Sibling hashes from leaf `index` up to the root
+        """
+        proof = []
+        for level in self.levels[:-1]:
+            sibling = index ^ 1
+            if sibling < len(level):
+                proof.append(level[sibling])
+            index //= 2
+        return proof
+
+
+def compute_root(leaf: bytes, index: int, size: int, proof: Sequence[bytes]) -> bytes:
+    """
+    Root of a tree of `size` leaves holding `leaf` at `index`, according to `proof`.
+    Raises ValueError when the proof cannot belong to such a tree.
+    """
+    if not 0 <= index < size or size >= 2 ** 32:
+        raise ValueError(f'Index {index} is out of a batch of {size}')
+
+    node = leaf
+    remaining = iter(proof)
+    width = size
+    while width > 1:
+        if index % 2 or index + 1 < width:
+            sibling = next(remaining, None)
+            if sibling is None or len(sibling) != HASH_SIZE:
+                raise ValueError('Proof is too short or holds invalid hashes')
+            node = node_hash(sibling, node) if index % 2 else node_hash(node, sibling)
+        index //= 2
+        width = (width + 1) // 2
+
+    if next(remaining, None) is not None:
+        raise ValueError('Proof is too long')
+    return node
@@ -5,6 +5,7 @@ from polyswarmtransaction.transaction import Transaction
 
 @dataclasses.dataclass
 class WithdrawalTransaction(Transaction):
+    __slots__ = ('amount',)
     amount: str
 
 
@@ -13,6 +14,7 @@ class ApproveNectarReleaseTransaction(Transaction):
     """
     Transaction from relay approving a NCT transfer from the source to the given address
     """
+    __slots__ = ('destination', 'amount', 'transaction_hash', 'block_hash', 'block_number')
     destination: str  # Ethereum address 160bit hex string
     amount: str  # Nectar amount in nct-wei
     transaction_hash: str  # Transaction hash for original transfer 256 hex string
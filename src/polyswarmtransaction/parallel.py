@@ -0,0 +1,203 @@
+import collections
+import dataclasses
+import itertools
+import multiprocessing
+import multiprocessing.pool
+import os
+
+import jsonschema
+from eth_keys.datatypes import PrivateKey
+from eth_typing import ChecksumAddress
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Union
+
+from polyswarmtransaction import codec, exceptions
+from polyswarmtransaction.transaction import SignedTransaction, Signer, Transaction, registry
+
+DEFAULT_PRELOAD = ('polyswarmtransaction.bounty', 'polyswarmtransaction.nectar')
+DEFAULT_CHUNKSIZE = 64
+
+# Payload dicts, signed transactions, or payload dicts still encoded as JSON
+Payload = Union[Dict[str, str], SignedTransaction, str, bytes]
+
+
+@dataclasses.dataclass
+class VerificationResult:
+    """
+    Outcome of verifying a single signed payload.
+
+    Holds either the recovered `address` and the loaded `transaction`, or the `error` explaining the rejection
+    """
+    address: Optional[ChecksumAddress] = None
+    transaction: Optional[Transaction] = None
+    error: Optional[exceptions.PolySwarmTransactionException] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def verify_payload(payload: Payload) -> VerificationResult:
+    """
+    Verify a single payload, turning any failure into a typed `PolySwarmTransactionException`
+    """
+    try:
+        if isinstance(payload, (str, bytes)):
+            payload = codec.loads(payload)
+        signed = payload if isinstance(payload, SignedTransaction) else SignedTransaction.from_payload(payload)
+        verified = signed.verify()
+    except exceptions.PolySwarmTransactionException as e:
+        return VerificationResult(error=e)
+    except (TypeError, ValueError, KeyError, RecursionError, jsonschema.ValidationError) as e:
+        # json.JSONDecodeError is a ValueError, malformed bodies raise KeyError/TypeError, and json raises
+        # RecursionError on deeply nested messages, which anyone can sign with their own key
+        return VerificationResult(error=exceptions.WrongPayloadError(f'{e.__class__.__name__}: {e}'))
+    except Exception as e:
+        # Last resort, an error raised in a worker would drop the results of the whole run
+        return VerificationResult(error=exceptions.WrongPayloadError(f'Unexpected {e.__class__.__name__}: {e}'))
+
+    return VerificationResult(address=verified.sender, transaction=verified.transaction)
+
+
+def verify_chunk(payloads: List[Payload]) -> List[VerificationResult]:
+    return [verify_payload(payload) for payload in payloads]
+
+
+def _initialize_worker(preload: Iterable[str]):
+    # Register transaction modules once per worker, so the first chunk doesn't pay for it
+    registry.preload(*preload)
+
+
+def _chunks(items: Iterable[Any], chunksize: int) -> Iterator[List[Any]]:
+    iterator = iter(items)
+    chunk = list(itertools.islice(iterator, chunksize))
+    while chunk:
+        yield chunk
+        chunk = list(itertools.islice(iterator, chunksize))
+
+
+def imap_ordered(pool: multiprocessing.pool.Pool, function: Callable[[List[Any]], List[Any]], items: Iterable[Any],
+                 chunksize: int, window: int) -> Iterator[Any]:
+    """
+    Map `function` over chunks of `items` on `pool`, yielding the individual results in input order.
+
+    Unlike `Pool.imap`, at most `window` chunks are in flight at once, so `items` is consumed lazily
+    and memory stays bounded no matter how long the input is.
+    """
+    pending = collections.deque()
+    for chunk in _chunks(items, chunksize):
+        pending.append(pool.apply_async(function, (chunk,)))
+        if len(pending) >= window:
+            yield from pending.popleft().get()
+
+    while pending:
+        yield from pending.popleft().get()
+
+
+class VerificationPool:
+    """
+    Reusable pool of worker processes verifying signed payloads.
+
+    Workers are started and warmed up (transaction modules imported) when the pool is created,
+    so later batches, however short, don't pay for process startup.
+    """
+    def __init__(self, workers: Optional[int] = None, preload: Iterable[str] = DEFAULT_PRELOAD):
+        self.workers = workers or os.cpu_count() or 1
+        self._pool = multiprocessing.Pool(self.workers, initializer=_initialize_worker, initargs=(tuple(preload),))
+
+    def __enter__(self) -> 'VerificationPool':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def imap(self, payloads: Iterable[Payload], chunksize: int = DEFAULT_CHUNKSIZE) -> Iterator[VerificationResult]:
+        return imap_ordered(self._pool, verify_chunk, (self.__to_payload(p) for p in payloads),
+                            chunksize, self.workers * 2)
+
+    def verify_many(self, payloads: Iterable[Payload], chunksize: int = DEFAULT_CHUNKSIZE) -> List[VerificationResult]:
+        return list(self.imap(payloads, chunksize))
+
+    def close(self):
+        self._pool.close()
+        self._pool.join()
+
+    @staticmethod
+    def __to_payload(payload: Payload) -> Union[Dict[str, str], str, bytes]:
+        if isinstance(payload, SignedTransaction):
+            return payload.payload
+        return payload
+
+
+_signer: Optional[Signer] = None
+
+
+def _initialize_signer(private_key: bytes, preload: Iterable[str]):
+    global _signer
+    _signer = Signer(private_key)
+    registry.preload(*preload)
+
+
+def sign_chunk(transactions: List[Transaction]) -> List[SignedTransaction]:
+    return _signer.sign_many(transactions)
+
+
+class SigningPool:
+    """
+    Reusable pool of worker processes signing transactions with the same key.
+
+    The key is loaded once per worker when the pool is created.
+    """
+    def __init__(self, private_key: Union[bytes, PrivateKey], workers: Optional[int] = None,
+                 preload: Iterable[str] = DEFAULT_PRELOAD):
+        if isinstance(private_key, PrivateKey):
+            private_key = private_key.to_bytes()
+        self.workers = workers or os.cpu_count() or 1
+        self._pool = multiprocessing.Pool(self.workers, initializer=_initialize_signer,
+                                          initargs=(bytes(private_key), tuple(preload)))
+
+    def __enter__(self) -> 'SigningPool':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def imap(self, transactions: Iterable[Transaction],
+             chunksize: int = DEFAULT_CHUNKSIZE) -> Iterator[SignedTransaction]:
+        """
+        Sign `transactions` lazily, yielding them in input order
+        """
+        return imap_ordered(self._pool, sign_chunk, transactions, chunksize, self.workers * 2)
+
+    def close(self):
+        self._pool.close()
+        self._pool.join()
+
+
+_default_pool: Optional[VerificationPool] = None
+
+
+def get_default_pool(workers: Optional[int] = None) -> VerificationPool:
+    """
+    Get the shared pool used by `verify_many`, creating it on first use (or when `workers` changes)
+    """
+    global _default_pool
+    if _default_pool is None or (workers and _default_pool.workers != workers):
+        if _default_pool is not None:
+            _default_pool.close()
+        _default_pool = VerificationPool(workers)
+    return _default_pool
+
+
+def verify_many(payloads: Iterable[Payload], workers: Optional[int] = None, chunksize: int = DEFAULT_CHUNKSIZE,
+                pool: Optional[VerificationPool] = None) -> List[VerificationResult]:
+    """
+    Verify every payload in parallel, returning one `VerificationResult` per payload in input order.
+
+    Uses the shared pool from `get_default_pool` unless an explicit `pool` is given.
+    Passing `workers=0` verifies inline in the calling process.
+    """
+    if workers == 0 and pool is None:
+        return verify_chunk(list(payloads))
+
+    pool = pool or get_default_pool(workers)
+    return pool.verify_many(payloads, chunksize)
@@ -0,0 +1,148 @@
+import collections
+import math
+import threading
+import time
+
+from typing import Callable, List, Union
+
+from polyswarmtransaction import exceptions
+from polyswarmtransaction.transaction import SignedTransaction
+
+LN2 = math.log(2)
+
+
+class BloomFilter:
+    """
+    Fixed size set of hashes answering membership with no false negatives and a bounded false positive rate.
+
+    Sized for `capacity` entries at `error_rate`. Entries must be uniformly distributed digests
+    of at least 16 bytes, like keccak hashes, which are used directly as bit indexes.
+    """
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / LN2 ** 2))
+        self.hashes = max(1, round(self.size / capacity * LN2))
+        self.count = 0
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def __contains__(self, digest: bytes) -> bool:
+        return self.contains_indexes(self.indexes(digest))
+
+    @property
+    def false_positive_rate(self) -> float:
+        """
+        Probability of a false positive given the entries added so far
+        """
+        return (1 - math.exp(-self.hashes * self.count / self.size)) ** self.hashes
+
+    def indexes(self, digest: bytes) -> List[int]:
+        # Double hashing (Kirsch-Mitzenmacher) on two 64 bit halves of the digest
+        first = int.from_bytes(digest[:8], 'big')
+        second = int.from_bytes(digest[8:16], 'big') | 1
+        return [(first + i * second) % self.size for i in range(self.hashes)]
+
+    def contains_indexes(self, indexes: List[int]) -> bool:
+        bits = self.bits
+        return all(bits[index >> 3] & (1 << (index & 7)) for index in indexes)
+
+    def add(self, digest: bytes):
+        self.add_indexes(self.indexes(digest))
+
+    def add_indexes(self, indexes: List[int]):
+        bits = self.bits
+        for index in indexes:
+            bits[index >> 3] |= 1 << (index & 7)
+        self.count += 1
+
+
+class ReplayDetector:
+    """
+    Detects signed transactions seen within the last `window` seconds, in fixed memory.
+
+    Transaction hashes are stored in `generations + 1` rotating Bloom filters, each covering `window / generations`
+    seconds. Each one is sized for the whole `capacity` (the expected number of transactions per window), which may
+    all arrive within a single generation. Every hash is remembered for at least `window` seconds. The last
+    `recent_size` hashes are also kept exactly, so quick retries are always answered without relying on the filters.
+
+    A transaction never seen before is reported as a replay with probability at most `error_rate`, as long as fewer
+    than `capacity` transactions arrive per window, however they are spread over it; memory stays the same whatever
+    the traffic.
+    With the defaults (one million transactions per hour, one in a million false positives) the filters take 20MB,
+    and the exact set about 2.5MB (roughly 150 bytes per hash).
+    """
+    def __init__(self, window: float = 3600, capacity: int = 1000000, error_rate: float = 1e-6, generations: int = 4,
+                 recent_size: int = 16384, clock: Callable[[], float] = time.monotonic):
+        self.window = window
+        self.generations = generations
+        self.recent_size = recent_size
+        self.clock = clock
+        # Split the error budget between the filters, any of them may answer a false positive
+        self.__capacity = max(1, capacity)
+        self.__generation_error_rate = error_rate / (generations + 1)
+        self.__generation_length = window / generations
+        self.__filters = collections.deque(self.__new_filter() for _ in range(generations + 1))
+        self.__generation_start = clock()
+        self.__recent = collections.OrderedDict()
+        self.__lock = threading.Lock()
+
+    @property
+    def memory_size(self) -> int:
+        """
+        Bytes held by the Bloom filters
+        """
+        return sum(len(bloom_filter.bits) for bloom_filter in self.__filters)
+
+    @property
+    def false_positive_rate(self) -> float:
+        """
+        Current probability for a new transaction to be reported as a replay
+        """
+        rate = 1.0
+        for bloom_filter in self.__filters:
+            rate *= 1 - bloom_filter.false_positive_rate
+        return 1 - rate
+
+    def is_replay(self, tx_hash: Union[bytes, SignedTransaction]) -> bool:
+        """
+        Record `tx_hash`, returning whether it was already seen
+        """
+        if isinstance(tx_hash, SignedTransaction):
+            tx_hash = tx_hash.message_hash
+        tx_hash = bytes(tx_hash)
+
+        with self.__lock:
+            self.__rotate()
+            if tx_hash in self.__recent:
+                return True
+
+            self.__recent[tx_hash] = None
+            if len(self.__recent) > self.recent_size:
+                self.__recent.popitem(last=False)
+
+            indexes = self.__filters[-1].indexes(tx_hash)
+            if any(bloom_filter.contains_indexes(indexes) for bloom_filter in self.__filters):
+                return True
+
+            self.__filters[-1].add_indexes(indexes)
+            return False
+
+    def check(self, signed: SignedTransaction):
+        """
+        Record `signed`, raising `ReplayedTransactionError` if it was already seen
+        """
+        if self.is_replay(signed.message_hash):
+            raise exceptions.ReplayedTransactionError(f'{signed.tx_hash.hex()} was already seen')
+
+    def __new_filter(self) -> BloomFilter:
+        return BloomFilter(self.__capacity, self.__generation_error_rate)
+
+    def __rotate(self):
+        elapsed = self.clock() - self.__generation_start
+        if elapsed < self.__generation_length:
+            return
+
+        expired = min(int(elapsed // self.__generation_length), self.generations + 1)
+        for _ in range(expired):
+            self.__filters.popleft()
+            self.__filters.append(self.__new_filter())
+        self.__generation_start += int(elapsed // self.__generation_length) * self.__generation_length
@@ -0,0 +1,63 @@
+import dataclasses
+import json
+import operator
+
+from typing import Any, Callable, Dict, Iterator, Type
+
+Serializer = Callable[[Any], str]
+
+_serializers: Dict[type, Serializer] = {}
+
+
+def _encode_dataclass(value: Any) -> Any:
+    # Nested dataclasses are written as dicts, like dataclasses.asdict would
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return dataclasses.asdict(value)
+    raise TypeError(f'Object of type {value.__class__.__name__} is not JSON serializable')
+
+
+# Same settings as json.dumps defaults, so output matches it byte for byte
+_encoder = json.JSONEncoder(default=_encode_dataclass)
+
+
+def get_serializer(cls: Type) -> Serializer:
+    """
+    Get the serializer for `cls`, compiling it on first use
+    """
+    try:
+        return _serializers[cls]
+    except KeyError:
+        serializer = _serializers[cls] = compile_serializer(cls)
+        return serializer
+
+
+def compile_serializer(cls: Type) -> Serializer:
+    """
+    Build a function writing the fields of dataclass `cls` as `json.dumps(dataclasses.asdict(instance))` would.
+
+    Field values are encoded in place, instead of being deep copied into a new dict first.
+    """
+    names = tuple(field.name for field in dataclasses.fields(cls))
+    if not names:
+        return lambda instance: '{}'
+
+    getter = operator.attrgetter(*names)
+    if len(names) == 1:
+        name = names[0]
+        return lambda instance: _encoder.encode({name: getter(instance)})
+
+    return lambda instance: _encoder.encode(dict(zip(names, getter(instance))))
+
+
+def serialize_chunks(instance: Any) -> Iterator[str]:
+    """
+    Same JSON as `get_serializer(instance.__class__)(instance)`, in small chunks, never holding the whole text
+    """
+    return iterencode({field.name: getattr(instance, field.name) for field in dataclasses.fields(instance)})
+
+
+def iterencode(obj: Any) -> Iterator[str]:
+    """
+    `json.dumps(obj)` in small chunks
+    """
+    return _encoder.iterencode(obj)
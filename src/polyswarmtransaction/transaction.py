@@ -1,18 +1,26 @@
 import dataclasses
-import json
 import importlib
 import importlib.util
-import jsonschema
+import mmap
+import os
+import struct
 
-from eth_keys.datatypes import PrivateKey, Signature, PublicKey
-from eth_keys.exceptions import ValidationError, BadSignature
 from eth_typing import ChecksumAddress
 from hexbytes import HexBytes
 from types import ModuleType
-from typing import Any, Dict, Union, Type, Tuple
-from web3 import Web3
+from typing import TYPE_CHECKING, Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Union, Type, Tuple
 
-from polyswarmtransaction import exceptions
+from polyswarmtransaction import codec, exceptions, hashing, instrumentation, merkle, serialization, validation
+from polyswarmtransaction.cache import KeyDirectory, RecoveryCache
+from polyswarmtransaction.hashing import Buffer
+
+# eth_keys (through eth_utils), asyncio and concurrent.futures are imported where used, they would double the
+# package import time
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+    from polyswarmtransaction.admission import AdmissionFilter
+    from eth_keys.backends import BaseECCBackend
+    from eth_keys.datatypes import PrivateKey, PublicKey, Signature
 
 TRANSACTION_SCHEMA = {
     "$schema": "http://json-schema.org/draft-07/schema#",
@@ -35,112 +43,287 @@ TRANSACTION_SCHEMA = {
     },
     "required": ["name", "from", "data"]
 }
+TRANSACTION_VALIDATOR = validation.LazySchemaValidator(TRANSACTION_SCHEMA)
+
+# Import paths of the eth_keys backends signing and recovering, fastest first. `native` is the pure Python
+# implementation of eth_keys.
+ECC_BACKENDS: Dict[str, str] = {
+    'coincurve': 'eth_keys.backends.coincurve.CoinCurveECCBackend',
+    'native': 'eth_keys.backends.native.NativeECCBackend',
+}
+FAST_ECC_BACKENDS = frozenset(['coincurve'])
+# Set to one of PRODUCTION_TRUE_VALUES (case insensitive) to refuse the slow backends, from the package import on
+PRODUCTION_ENVIRONMENT_VARIABLE = 'POLYSWARMTRANSACTION_PRODUCTION'
+PRODUCTION_TRUE_VALUES = frozenset(['1', 'true', 'yes', 'on'])
+
+_ecc_backend_name: str = 'native'
+# Instantiated on first use by get_ecc_backend()
+_ecc_backend: Optional['BaseECCBackend'] = None
+
+
+def is_coincurve_available() -> bool:
+    # Same as eth_keys.backends.is_coincurve_available, without importing eth_keys
+    return importlib.util.find_spec('coincurve') is not None
+
+
+def available_ecc_backends() -> List[str]:
+    return [name for name in ECC_BACKENDS if name != 'coincurve' or is_coincurve_available()]
+
+
+def load_ecc_backend(name: str) -> 'BaseECCBackend':
+    """
+    New instance of eth_keys backend `name`
+    """
+    module_name, class_name = ECC_BACKENDS[name].rsplit('.', 1)
+    return getattr(importlib.import_module(module_name), class_name)()
+
+
+def get_ecc_backend() -> 'BaseECCBackend':
+    global _ecc_backend
+    if _ecc_backend is None:
+        _ecc_backend = load_ecc_backend(_ecc_backend_name)
+    return _ecc_backend
+
+
+def ecc_backend_name() -> str:
+    return _ecc_backend_name
+
+
+def is_production_environment() -> bool:
+    """
+    Whether POLYSWARMTRANSACTION_PRODUCTION turns production mode on, `0`, `false` or an empty value leaving it off
+    """
+    return os.environ.get(PRODUCTION_ENVIRONMENT_VARIABLE, '').strip().lower() in PRODUCTION_TRUE_VALUES
+
+
+def set_ecc_backend(name: Optional[str] = None, production: Optional[bool] = None):
+    """
+    Sign and recover with eth_keys backend `name`, or the fastest one installed when None.
+
+    In production mode, on by default when POLYSWARMTRANSACTION_PRODUCTION is `1`, `true`, `yes` or `on`, only fast
+    backends are accepted and SlowBackendError is raised otherwise.
+    """
+    global _ecc_backend, _ecc_backend_name
+    if production is None:
+        production = is_production_environment()
+
+    available = available_ecc_backends()
+    if name is None:
+        name = available[0]
+    if name not in available:
+        raise ValueError(f'Unknown or missing ECC backend {name}, available: {", ".join(available)}')
+    if production and name not in FAST_ECC_BACKENDS:
+        raise exceptions.SlowBackendError(f'ECC backend {name} is too slow for production, install coincurve')
+
+    _ecc_backend = None
+    _ecc_backend_name = name
+
+
+def verify_signer(msg_hash: bytes, signature: 'Signature', public_key: 'PublicKey') -> bool:
+    """
+    Whether recovering `signature` of `msg_hash` gives `public_key`, without deriving its address.
+
+    The native backend verifies the signature, R = u1*G + u2*Q must then have x = r and the y parity given by the
+    recovery id `v`, as recovery requires. Other backends recover as fast as they verify, the key is compared instead.
+    """
+    from eth_keys.backends import NativeECCBackend
+
+    backend = get_ecc_backend()
+    if not isinstance(backend, NativeECCBackend):
+        from eth_keys.exceptions import BadSignature
+
+        try:
+            return backend.ecdsa_recover(msg_hash, signature) == public_key
+        except BadSignature:
+            return False
+
+    from eth_keys.backends.native.ecdsa import decode_public_key
+    from eth_keys.backends.native.jacobian import fast_add, fast_multiply, inv
+    from eth_keys.constants import SECPK1_G, SECPK1_N
+
+    v, r, s = signature.vrs
+    if not 0 < r < SECPK1_N or not 0 < s < SECPK1_N:
+        return False
+    w = inv(s, SECPK1_N)
+    u1 = int.from_bytes(msg_hash, 'big') * w % SECPK1_N
+    x, y = fast_add(fast_multiply(SECPK1_G, u1),
+                    fast_multiply(decode_public_key(public_key.to_bytes()), r * w % SECPK1_N))
+    return x == r and y % 2 == v
+
+
+# Binary encoding of a SignedTransaction: version byte, 65 bytes signature, then raw_transaction UTF-8 bytes
+ENCODING_VERSION = 1
+SIGNATURE_SIZE = 65
+_ENCODING_HEADER = bytes([ENCODING_VERSION])
+_ENCODED_SIGNATURE_END = 1 + SIGNATURE_SIZE
+# A BatchSignedTransaction adds its index, batch size and proof length after the signature, then the proof hashes
+BATCH_ENCODING_VERSION = 2
+_BATCH_ENCODING_HEADER = bytes([BATCH_ENCODING_VERSION])
+_BATCH_FIELDS = struct.Struct('>IIB')
+
+# Bytes hashed and written at once by Signer.sign_stream()
+STREAM_CHUNK_SIZE = 64 * 1024
 
 
 @dataclasses.dataclass
 class Transaction:
+    # Subclasses declare __slots__ for their fields to drop the per-instance __dict__
+    __slots__ = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        registry.register(cls)
+
     @property
     def data(self) -> Dict[str, Any]:
         return dataclasses.asdict(self)
 
-    def sign(self, private_key: HexBytes) -> 'SignedTransaction':
-        key = self.load_key(private_key)
-        message = self.__message(key.public_key)
-        signature = self.sign_message(message, key)
-        return SignedTransaction(message, signature.to_bytes())
+    def serialize_data(self) -> str:
+        """
+        `data` as JSON, exactly as `json.dumps(self.data)` would write it
+        """
+        if self.__class__.data is Transaction.data:
+            return serialization.get_serializer(self.__class__)(self)
+        # Subclass defines its own data
+        return codec.dumps(self.data)
+
+    def serialize_data_chunks(self) -> Iterator[str]:
+        """
+        `serialize_data()` in small chunks, for data too large to hold as a single string
+        """
+        if self.__class__.data is Transaction.data:
+            return serialization.serialize_chunks(self)
+        return serialization.iterencode(self.data)
+
+    @classmethod
+    def from_data(cls, data: Dict[str, Any]) -> 'Transaction':
+        """
+        Build the transaction from the `data` of a signed message, type checking it against the class fields first
+        """
+        return cls(**validation.get_decoder(cls)(data))
+
+    def sign(self, private_key: Union[HexBytes, 'PrivateKey']) -> 'SignedTransaction':
+        return Signer(private_key).sign(self)
 
-    def __message(self, public_key: PublicKey) -> str:
-        body = {
-            "name": f'{self.__class__.__module__}:{self.__class__.__name__}',
-            "from": public_key.to_checksum_address(),
-            "data": self.data
-        }
-        return json.dumps(body)
+    @staticmethod
+    def sign_batch(transactions: Iterable['Transaction'],
+                   private_key: Union[HexBytes, 'PrivateKey']) -> List['BatchSignedTransaction']:
+        """
+        Sign `transactions` together, see `Signer.sign_batch`
+        """
+        return Signer(private_key).sign_batch(transactions)
 
     @staticmethod
-    def load_key(private_key: Union[HexBytes, PrivateKey]) -> PrivateKey:
+    def load_key(private_key: Union[HexBytes, 'PrivateKey']) -> 'PrivateKey':
+        from eth_keys.datatypes import PrivateKey
+        from eth_keys.exceptions import ValidationError
+
         if isinstance(private_key, PrivateKey):
             # Lifts the need to convert to bytes and back to PrivateKey
             return private_key
 
         try:
-            return PrivateKey(private_key)
+            return PrivateKey(private_key, backend=get_ecc_backend())
         except ValidationError:
             raise exceptions.InvalidKeyError(f'{private_key} is not a valid ethereum private key')
 
     @staticmethod
-    def sign_message(message: str, private_key: PrivateKey):
-        return private_key.sign_msg_hash(Transaction.hash(message))
+    def sign_message(message: str, private_key: 'PrivateKey') -> 'Signature':
+        return get_ecc_backend().ecdsa_sign(Transaction.hash(message), private_key)
 
     @staticmethod
-    def hash(message: str) -> bytes:
-        return Web3.keccak(text=message)
+    def hash(message: Union[str, Buffer]) -> bytes:
+        return hashing.keccak(message)
 
 
-class SignedTransaction:
-    raw_transaction: str
-    signature: HexBytes
+def transaction_name(transaction: Type[Transaction]) -> str:
+    return f'{transaction.__module__}:{transaction.__name__}'
 
-    def __init__(self, raw_transaction: str, signature: Union[bytes, str, int]):
-        self.raw_transaction = raw_transaction
-        self.signature = HexBytes(signature)
 
-    @property
-    def payload(self) -> Dict[str, str]:
-        return {
-            'raw_transaction': self.raw_transaction,
-            'signature': self.signature.hex()
-        }
+class TransactionRegistry:
+    """
+    Maps transaction names (`<module>:<class>`) to their `Transaction` class.
 
-    def ecrecover(self) -> ChecksumAddress:
-        public_key = self.__recover()
-        self.__validate(public_key)
-        return public_key.to_checksum_address()
+    Every `Transaction` subclass registers itself when defined. Unknown names are imported dynamically,
+    unless the registry is restricted to an allowlist, in which case lookup never leaves the registry.
 
-    def __recover(self) -> PublicKey:
-        message_hash = Transaction.hash(self.raw_transaction)
-        return PublicKey.recover_from_msg_hash(message_hash, self.__load_signature())
+    Servers that fork workers should `preload` their transaction modules first, so workers share the
+    fully built registry copy-on-write.
+    """
+    def __init__(self):
+        self.transactions: Dict[str, Type[Transaction]] = {}
+        self.__allowed = self.transactions
+        self.__restricted = False
 
-    def __load_signature(self) -> Signature:
-        try:
-            return Signature(signature_bytes=self.signature)
-        except (TypeError, ValidationError, BadSignature):
-            raise exceptions.InvalidSignatureError(f'{self.signature} is not a valid signature')
+    @property
+    def restricted(self) -> bool:
+        return self.__restricted
 
-    def __validate(self, public_key: PublicKey):
-        transaction_address = json.loads(self.raw_transaction)['from']
-        recovered_address = public_key.to_checksum_address()
-        if transaction_address != recovered_address:
-            raise exceptions.WrongSignatureError(f'{recovered_address} did not match expected {transaction_address}')
+    def register(self, transaction: Type[Transaction]) -> Type[Transaction]:
+        self.transactions[transaction_name(transaction)] = transaction
+        return transaction
 
-    def transaction(self) -> Transaction:
-        loaded = self.__load_validated_transaction()
-        transaction = self.__import_transaction(loaded)
-        return transaction(**loaded['data'])
+    def preload(self, *module_names: str):
+        """
+        Import the given modules, registering every transaction they define, and compile their (de)serializers
+        """
+        for module_name in module_names:
+            importlib.import_module(module_name)
+
+        for transaction in list(self.transactions.values()):
+            validation.get_decoder(transaction)
+            serialization.get_serializer(transaction)
+
+    def restrict(self, names: Optional[Iterable[str]] = None):
+        """
+        Only accept `names` (all currently registered transactions by default), never importing anything
+        """
+        if names is None:
+            allowed = dict(self.transactions)
+        else:
+            allowed = {name: self.get(name) for name in names}
+
+        self.__allowed = allowed
+        self.__restricted = True
+
+    def unrestrict(self):
+        self.__allowed = self.transactions
+        self.__restricted = False
+
+    def get(self, name: str) -> Type[Transaction]:
+        try:
+            return self.__allowed[name]
+        except KeyError:
+            if self.__restricted:
+                raise exceptions.UnsupportedTransactionError(f'{name} is not an allowed transaction')
 
-    def __load_validated_transaction(self) -> Dict[str, Any]:
-        loaded = json.loads(self.raw_transaction)
-        jsonschema.validate(loaded, TRANSACTION_SCHEMA)
-        return loaded
+        transaction = self.__import_transaction(name)
+        self.transactions[name] = transaction
+        return transaction
 
-    def __import_transaction(self, loaded_transaction: Dict[str, Any]) -> Type[Transaction]:
-        module_name, class_name = self.__get_transaction_module_name(loaded_transaction)
+    def __import_transaction(self, name: str) -> Type[Transaction]:
+        module_name, class_name = self.__get_transaction_module_name(name)
         module = self.__import_transaction_module(module_name)
         return self.__import_transaction_class(module, class_name)
 
     @staticmethod
-    def __get_transaction_module_name(loaded_transaction: Dict[str, Any]) -> Tuple[str, str]:
-        parts = loaded_transaction['name'].rsplit(':', 1)
+    def __get_transaction_module_name(name: str) -> Tuple[str, str]:
+        parts = name.rsplit(':', 1)
         # Assuming this was checked by the schema first
         return parts[0], parts[1]
 
     @staticmethod
     def __import_transaction_module(module_name: str) -> ModuleType:
-        mod_spec = importlib.util.find_spec(module_name)
-        if not mod_spec:
-            raise exceptions.UnsupportedTransactionError(f'Missing {module_name}')
+        # find_spec imports the parent packages, raising ImportError when they are missing, and ValueError on
+        # relative names
+        try:
+            mod_spec = importlib.util.find_spec(module_name)
+            if not mod_spec:
+                raise exceptions.UnsupportedTransactionError(f'Missing {module_name}')
 
-        return importlib.import_module(mod_spec.name)
+            return importlib.import_module(mod_spec.name)
+        except (ImportError, ValueError) as e:
+            raise exceptions.UnsupportedTransactionError(f'Cannot import {module_name}: {e}')
 
     @staticmethod
     def __import_transaction_class(module: ModuleType, class_name: str) -> Type[Transaction]:
@@ -148,30 +331,521 @@ class SignedTransaction:
             raise exceptions.UnsupportedTransactionError(f'{module.__name__} has no class {class_name}')
 
         transaction = getattr(module, class_name)
-        if not issubclass(transaction, Transaction):
+        if not isinstance(transaction, type) or not issubclass(transaction, Transaction):
             raise exceptions.UnsupportedTransactionError(f'{module.__name__}:{class_name} is not a Transaction')
 
         return transaction
 
 
+registry = TransactionRegistry()
+registry.register(Transaction)
+
+
+@dataclasses.dataclass
+class VerifiedTransaction:
+    """
+    Result of `SignedTransaction.verify()`: the recovered sender, the parsed body and the loaded transaction
+    """
+    sender: ChecksumAddress
+    body: Dict[str, Any]
+    transaction: Transaction
+
+
+@dataclasses.dataclass
+class StreamSignature:
+    """
+    Result of `Signer.sign_stream()`: the signature of the `size` bytes message written to the sink, and its hash
+    """
+    signature: bytes
+    message_hash: bytes
+    size: int
+
+
+class SignedTransaction:
+    # Slotted and holding the signature as plain bytes, queues keep millions of these
+    __slots__ = ('__raw_transaction', '__signature_bytes', '__message_hash', '__body', '__signature')
+    # Shared cache of recovered addresses, disabled unless set
+    recovery_cache: Optional[RecoveryCache] = None
+    # Public keys of known senders, verified against rather than recovering the sender, disabled unless set
+    key_directory: Optional[KeyDirectory] = None
+    # Cheap checks run before any cryptography, disabled unless set
+    admission_filter: Optional['AdmissionFilter'] = None
+
+    def __init__(self, raw_transaction: Union[str, Buffer], signature: Union[Buffer, str, int]):
+        """
+        `raw_transaction` may be given as received, `bytes` or `memoryview` included. It is hashed in place, and parsed
+        in place by the orjson codec backend (the json backend parses a copy).
+        `signature` is either the raw 65 bytes or their hex string.
+        """
+        self.raw_transaction = raw_transaction
+        self.signature = signature
+
+    @property
+    def raw_transaction(self) -> Union[str, Buffer]:
+        return self.__raw_transaction
+
+    @raw_transaction.setter
+    def raw_transaction(self, raw_transaction: Union[str, Buffer]):
+        self.__raw_transaction = raw_transaction
+        # Memoized from the previous message, which must not stand for the new one
+        self.__message_hash = None
+        self.__body = None
+
+    @property
+    def signature(self) -> HexBytes:
+        return HexBytes(self.__signature_bytes)
+
+    @signature.setter
+    def signature(self, signature: Union[Buffer, str, int]):
+        self.__signature_bytes = signature if type(signature) is bytes else bytes(HexBytes(signature))
+        self.__signature = None
+
+    @property
+    def signature_bytes(self) -> bytes:
+        return self.__signature_bytes
+
+    def __reduce__(self):
+        raw_transaction = self.raw_transaction
+        if isinstance(raw_transaction, memoryview):
+            # memoryview cannot be pickled
+            raw_transaction = raw_transaction.tobytes()
+        return self.__class__, (raw_transaction, self.__signature_bytes)
+
+    def encode(self) -> bytes:
+        """
+        Compact binary encoding, `raw_transaction` bytes unchanged next to the raw signature
+        """
+        if len(self.__signature_bytes) != SIGNATURE_SIZE:
+            raise exceptions.InvalidSignatureError(f'{self.signature} is not a valid signature')
+
+        raw_transaction = self.raw_transaction
+        if isinstance(raw_transaction, str):
+            raw_transaction = raw_transaction.encode()
+        return b''.join((_ENCODING_HEADER, self.__signature_bytes, raw_transaction))
+
+    @classmethod
+    def decode(cls, data: Buffer) -> 'SignedTransaction':
+        """
+        Load a transaction written by `encode()`. `raw_transaction` is a memoryview of `data`, nothing is copied.
+        """
+        view = memoryview(data)
+        if view and view[0] == BATCH_ENCODING_VERSION:
+            return BatchSignedTransaction.decode(view)
+        if len(view) <= _ENCODED_SIGNATURE_END or view[0] != ENCODING_VERSION:
+            raise exceptions.InvalidFrameError('Not a binary encoded signed transaction')
+        return cls(view[_ENCODED_SIGNATURE_END:], view[1:_ENCODED_SIGNATURE_END].tobytes())
+
+    @classmethod
+    def from_payload(cls, payload: Dict[str, Any]) -> 'SignedTransaction':
+        """
+        Load `payload`, as a `BatchSignedTransaction` when it holds a proof
+        """
+        if 'proof' in payload:
+            return BatchSignedTransaction(**payload)
+        return SignedTransaction(**payload)
+
+    @classmethod
+    def from_file(cls, file: Union[str, os.PathLike, BinaryIO, mmap.mmap],
+                  signature: Union[Buffer, str, int]) -> 'SignedTransaction':
+        """
+        Load the message written to `file` (a path, a file opened in binary mode or a mmap), as `Signer.sign_stream()`
+        does, along with its signature.
+
+        The file is memory mapped rather than read: hashing and recovering the sender run in place on the mapping,
+        the message is only copied when parsed.
+        """
+        if isinstance(file, mmap.mmap):
+            return cls(memoryview(file), signature)
+        if not isinstance(file, (str, os.PathLike)):
+            return cls(cls.__map_file(file), signature)
+        with open(file, 'rb') as opened:
+            return cls(cls.__map_file(opened), signature)
+
+    @staticmethod
+    def __map_file(file: BinaryIO) -> Buffer:
+        if os.fstat(file.fileno()).st_size == 0:
+            # Empty files cannot be mapped
+            return b''
+        # The mapping outlives the file descriptor, it is released along with the transaction
+        return memoryview(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+
+    @property
+    def payload(self) -> Dict[str, str]:
+        raw_transaction = self.raw_transaction
+        if not isinstance(raw_transaction, str):
+            raw_transaction = str(raw_transaction, 'utf-8')
+        return {
+            'raw_transaction': raw_transaction,
+            'signature': self.signature.hex()
+        }
+
+    @property
+    def message_hash(self) -> bytes:
+        """
+        keccak hash of `raw_transaction`, computed once
+        """
+        if self.__message_hash is None:
+            self.__message_hash = Transaction.hash(self.raw_transaction)
+        return self.__message_hash
+
+    @property
+    def signed_hash(self) -> bytes:
+        """
+        Hash covered by the signature, the message hash itself
+        """
+        return self.message_hash
+
+    @property
+    def tx_hash(self) -> HexBytes:
+        """
+        Identifier of this signed transaction: the keccak hash of `raw_transaction`
+        """
+        return HexBytes(self.message_hash)
+
+    @property
+    def body(self) -> Dict[str, Any]:
+        """
+        `raw_transaction` parsed as JSON, parsed once
+        """
+        if self.__body is None:
+            self.__body = codec.loads(self.raw_transaction)
+        return self.__body
+
+    def verify(self) -> VerifiedTransaction:
+        """
+        Recover the sender and load the transaction, parsing and hashing `raw_transaction` only once
+        """
+        if instrumentation.sinks:
+            return self.__verify_instrumented()
+
+        sender = self.ecrecover()
+        return VerifiedTransaction(sender, self.body, self.transaction())
+
+    def __verify_instrumented(self) -> VerifiedTransaction:
+        # Same steps as verify(), one at a time so each stage is timed
+        timer = instrumentation.Timer(instrumentation.VERIFY, len(self.raw_transaction))
+        try:
+            if self.admission_filter is not None:
+                self.admission_filter.check(self)
+                timer.lap(instrumentation.ADMIT)
+            self.message_hash
+            timer.lap(instrumentation.HASH)
+            sender = self.__recover_address()
+            timer.lap(instrumentation.RECOVER)
+            body = self.body
+            self.__validate(sender)
+            timer.lap(instrumentation.PARSE)
+            validation.validate(TRANSACTION_VALIDATOR, body)
+            timer.lap(instrumentation.VALIDATE)
+            transaction_class = registry.get(body['name'])
+            timer.name = body['name']
+            timer.lap(instrumentation.LOOKUP)
+            transaction = transaction_class.from_data(body['data'])
+            timer.lap(instrumentation.DECODE)
+        except Exception as e:
+            timer.finish(e)
+            raise
+
+        timer.finish()
+        return VerifiedTransaction(sender, body, transaction)
+
+    async def averify(self, executor: Optional['Executor'] = None) -> VerifiedTransaction:
+        """
+        Run `verify()` on `executor` (the loop default executor when None), keeping the event loop free
+        """
+        import asyncio
+
+        return await asyncio.get_event_loop().run_in_executor(executor, self.verify)
+
+    def ecrecover(self) -> ChecksumAddress:
+        if self.admission_filter is not None:
+            self.admission_filter.check(self)
+        recovered_address = self.__recover_address()
+        self.__validate(recovered_address)
+        return recovered_address
+
+    def __recover_address(self) -> ChecksumAddress:
+        cache = self.recovery_cache
+        if cache is None:
+            return self.__recover_sender()
+
+        recovered_address = cache.get_address(self.signed_hash, self.__signature_bytes)
+        if recovered_address is None:
+            recovered_address = self.__recover_sender()
+            cache.put_address(self.signed_hash, self.__signature_bytes, recovered_address)
+        return recovered_address
+
+    def __recover_sender(self) -> ChecksumAddress:
+        directory = self.key_directory
+        if directory is None:
+            return self.__recover().to_checksum_address()
+
+        body = self.body
+        claimed_address = body.get('from') if isinstance(body, dict) else None
+        known = directory.get_key(claimed_address)
+        if known is not None:
+            public_key, address = known
+            # Raw addresses matched, the claimed one must also be the exact checksum string, as after a recovery.
+            # A failed verification falls back to recovery, reporting the actual signer.
+            if address == claimed_address and verify_signer(self.signed_hash, self.__load_signature(), public_key):
+                return address
+
+        public_key = self.__recover()
+        recovered_address = public_key.to_checksum_address()
+        if recovered_address == claimed_address:
+            directory.add(public_key, recovered_address)
+        return recovered_address
+
+    def __recover(self) -> 'PublicKey':
+        from eth_keys.datatypes import PublicKey
+        from eth_keys.exceptions import BadSignature
+
+        try:
+            return PublicKey.recover_from_msg_hash(self.signed_hash, self.__load_signature(), backend=get_ecc_backend())
+        except BadSignature:
+            raise exceptions.InvalidSignatureError(f'{self.signature} cannot recover a public key')
+
+    def __load_signature(self) -> 'Signature':
+        if self.__signature is None:
+            from eth_keys.datatypes import Signature
+            from eth_keys.exceptions import BadSignature, ValidationError
+
+            try:
+                self.__signature = Signature(signature_bytes=self.__signature_bytes)
+            except (TypeError, ValidationError, BadSignature):
+                raise exceptions.InvalidSignatureError(f'{self.signature} is not a valid signature')
+        return self.__signature
+
+    def __validate(self, recovered_address: ChecksumAddress):
+        transaction_address = self.body['from']
+        if transaction_address != recovered_address:
+            raise exceptions.WrongSignatureError(f'{recovered_address} did not match expected {transaction_address}')
+
+    def transaction(self) -> Transaction:
+        loaded = self.__load_validated_transaction()
+        transaction = registry.get(loaded['name'])
+        return transaction.from_data(loaded['data'])
+
+    def __load_validated_transaction(self) -> Dict[str, Any]:
+        loaded = self.body
+        validation.validate(TRANSACTION_VALIDATOR, loaded)
+        return loaded
+
+
+class BatchSignedTransaction(SignedTransaction):
+    """
+    Transaction signed along with others, through the root of a Merkle tree of their messages.
+
+    `proof` links the message to the signed root, so it is verified alone like any `SignedTransaction`.
+    Transactions of a batch share a signature and root, recovered once thanks to `recovery_cache`.
+    """
+    __slots__ = ('__index', '__size', '__proof', '__signed_hash')
+    # Recovering a batch signature once for all its transactions, unlike single transactions it is on by default
+    recovery_cache: Optional[RecoveryCache] = RecoveryCache(maxsize=1024)
+
+    def __init__(self, raw_transaction: Union[str, Buffer], signature: Union[Buffer, str, int], index: int, size: int,
+                 proof: Iterable[Union[Buffer, str]]):
+        super().__init__(raw_transaction, signature)
+        # Exactly int, JSON payloads may hold floats and bools compare equal to integers
+        if type(index) is not int or type(size) is not int:
+            raise exceptions.WrongPayloadError(f'Batch index {index!r} and size {size!r} must be integers')
+        # Read only, the signed hash computed from them is memoized
+        self.__index = index
+        self.__size = size
+        self.__proof = tuple(item if type(item) is bytes else bytes(HexBytes(item)) for item in proof)
+
+    @SignedTransaction.raw_transaction.setter
+    def raw_transaction(self, raw_transaction: Union[str, Buffer]):
+        SignedTransaction.raw_transaction.fset(self, raw_transaction)
+        self.__signed_hash = None
+
+    @property
+    def index(self) -> int:
+        return self.__index
+
+    @property
+    def size(self) -> int:
+        return self.__size
+
+    @property
+    def proof(self) -> Tuple[bytes, ...]:
+        return self.__proof
+
+    def __reduce__(self):
+        raw_transaction, signature = super().__reduce__()[1]
+        return self.__class__, (raw_transaction, signature, self.index, self.size, self.proof)
+
+    @property
+    def payload(self) -> Dict[str, Any]:
+        payload = super().payload
+        payload['index'] = self.index
+        payload['size'] = self.size
+        payload['proof'] = [HexBytes(item).hex() for item in self.proof]
+        return payload
+
+    @property
+    def signed_hash(self) -> bytes:
+        """
+        Hash covered by the signature: the batch root computed from the message and its proof
+        """
+        if self.__signed_hash is None:
+            leaf = merkle.leaf_hash(self.raw_transaction)
+            try:
+                root = merkle.compute_root(leaf, self.index, self.size, self.proof)
+            except (TypeError, ValueError) as e:
+                raise exceptions.InvalidSignatureError(f'Invalid batch proof: {e}')
+            self.__signed_hash = merkle.root_digest(root, self.size)
+        return self.__signed_hash
+
+    def encode(self) -> bytes:
+        encoded = memoryview(super().encode())
+        return b''.join((_BATCH_ENCODING_HEADER, encoded[1:_ENCODED_SIGNATURE_END],
+                         _BATCH_FIELDS.pack(self.index, self.size, len(self.proof)), *self.proof,
+                         encoded[_ENCODED_SIGNATURE_END:]))
+
+    @classmethod
+    def decode(cls, data: Buffer) -> 'BatchSignedTransaction':
+        view = memoryview(data)
+        fields_end = _ENCODED_SIGNATURE_END + _BATCH_FIELDS.size
+        if len(view) <= fields_end or view[0] != BATCH_ENCODING_VERSION:
+            raise exceptions.InvalidFrameError('Not a binary encoded batch signed transaction')
+
+        index, size, length = _BATCH_FIELDS.unpack_from(view, _ENCODED_SIGNATURE_END)
+        proof_end = fields_end + length * merkle.HASH_SIZE
+        if len(view) <= proof_end:
+            raise exceptions.InvalidFrameError('Binary encoded batch signed transaction is truncated')
+        proof = [view[start:start + merkle.HASH_SIZE].tobytes() for start in range(fields_end, proof_end,
+                                                                                  merkle.HASH_SIZE)]
+        return cls(view[proof_end:], view[1:_ENCODED_SIGNATURE_END].tobytes(), index, size, proof)
+
+
+class Signer:
+    """
+    Signs transactions with a single private key.
+
+    The key, its public key, the sender checksum address and the message prefix of each transaction class are
+    derived once, so signing only costs serializing the data, one hash and one signature.
+    """
+    def __init__(self, private_key: Union[HexBytes, 'PrivateKey']):
+        self.private_key = Transaction.load_key(private_key)
+        self.public_key = self.private_key.public_key
+        self.address = self.public_key.to_checksum_address()
+        self.__prefixes: Dict[Type[Transaction], str] = {}
+
+    def sign(self, transaction: Transaction) -> SignedTransaction:
+        if instrumentation.sinks:
+            return self.__sign_instrumented(transaction)
+
+        message = self.message(transaction)
+        signature = Transaction.sign_message(message, self.private_key)
+        return SignedTransaction(message, signature.to_bytes())
+
+    def __sign_instrumented(self, transaction: Transaction) -> SignedTransaction:
+        timer = instrumentation.Timer(instrumentation.SIGN, 0)
+        try:
+            timer.name = transaction_name(transaction.__class__)
+            message = self.message(transaction)
+            timer.size = len(message)
+            timer.lap(instrumentation.SERIALIZE)
+            message_hash = Transaction.hash(message)
+            timer.lap(instrumentation.HASH)
+            signature = get_ecc_backend().ecdsa_sign(message_hash, self.private_key)
+            timer.lap(instrumentation.SIGNATURE)
+        except Exception as e:
+            timer.finish(e)
+            raise
+
+        timer.finish()
+        return SignedTransaction(message, signature.to_bytes())
+
+    def sign_many(self, transactions: Iterable[Transaction]) -> List[SignedTransaction]:
+        return [self.sign(transaction) for transaction in transactions]
+
+    def sign_batch(self, transactions: Iterable[Transaction]) -> List[BatchSignedTransaction]:
+        """
+        Sign `transactions` with a single signature over the Merkle root of their messages
+        """
+        messages = [self.message(transaction) for transaction in transactions]
+        if not messages:
+            return []
+
+        tree = merkle.MerkleTree([merkle.leaf_hash(message) for message in messages])
+        signature = get_ecc_backend().ecdsa_sign(merkle.root_digest(tree.root, tree.size), self.private_key).to_bytes()
+        return [BatchSignedTransaction(message, signature, index, tree.size, tree.proof(index))
+                for index, message in enumerate(messages)]
+
+    def sign_stream(self, transaction: Transaction, sink: BinaryIO,
+                    chunk_size: int = STREAM_CHUNK_SIZE) -> StreamSignature:
+        """
+        Write the message of `transaction` to `sink` (a file, `socket.makefile('wb')`, `io.BytesIO`...) in chunks of
+        about `chunk_size` bytes, hashing each chunk as it is written, and sign it.
+
+        The message is never held whole, memory used does not grow with its size. `SignedTransaction.from_file()`
+        loads it back, the signature being stored elsewhere.
+        """
+        hasher = hashing.new_keccak()
+        size = 0
+        for chunk in self.message_chunks(transaction, chunk_size):
+            data = chunk.encode()
+            hasher.update(data)
+            sink.write(data)
+            size += len(data)
+
+        message_hash = hasher.digest()
+        signature = get_ecc_backend().ecdsa_sign(message_hash, self.private_key).to_bytes()
+        return StreamSignature(signature, message_hash, size)
+
+    def message(self, transaction: Transaction) -> str:
+        """
+        Serialize `transaction` exactly as `json.dumps({"name": ..., "from": ..., "data": ...})` would
+        """
+        return self.__prefix(transaction.__class__) + transaction.serialize_data() + '}'
+
+    def message_chunks(self, transaction: Transaction, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[str]:
+        """
+        `message(transaction)` in chunks of about `chunk_size` characters
+        """
+        # The encoder yields a chunk per JSON token, too small to be hashed and written one by one
+        pending = [self.__prefix(transaction.__class__)]
+        pending_size = len(pending[0])
+        for chunk in transaction.serialize_data_chunks():
+            pending.append(chunk)
+            pending_size += len(chunk)
+            if pending_size >= chunk_size:
+                yield ''.join(pending)
+                pending.clear()
+                pending_size = 0
+
+        pending.append('}')
+        yield ''.join(pending)
+
+    def __prefix(self, transaction: Type[Transaction]) -> str:
+        try:
+            return self.__prefixes[transaction]
+        except KeyError:
+            prefix = self.__prefixes[transaction] = \
+                f'{{"name": {codec.dumps(transaction_name(transaction))}, "from": {codec.dumps(self.address)}, "data": '
+            return prefix
+
+
 @dataclasses.dataclass
 class CustomTransaction(Transaction):
     data_body: str = None
 
     def __init__(self, data_body=None, *args, **kwargs):
         if data_body is None:
-            data_body = json.dumps(args or kwargs)
+            data_body = codec.dumps(args or kwargs)
         self.data_body = data_body
         return super().__init__()
 
     @property
     def data(self) -> Dict[str, Any]:
-        return json.loads(self.data_body)
+        return codec.loads(self.data_body)
 
-    def __message(self, public_key: PublicKey) -> str:
-        body = {
-            "name": f'{self.__class__.__module__}:{self.__class__.__name__}',
-            "from": public_key.to_checksum_address(),
-            "data": self.data
-        }
-        return json.dumps(body)
+    @classmethod
+    def from_data(cls, data: Dict[str, Any]) -> 'CustomTransaction':
+        # Arbitrary data, nothing to check it against
+        return cls(**data)
+
+
+set_ecc_backend()
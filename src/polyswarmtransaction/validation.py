@@ -0,0 +1,141 @@
+import dataclasses
+
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional, Type, Union
+
+from polyswarmtransaction import exceptions
+
+if TYPE_CHECKING:
+    import jsonschema
+
+Checker = Callable[[Any], bool]
+Decoder = Callable[[Dict[str, Any]], Dict[str, Any]]
+
+_CONTAINERS = {list: list, List: list, dict: dict, Dict: dict}
+_decoders: Dict[type, Decoder] = {}
+
+
+def compile_schema(schema: Dict[str, Any]) -> 'jsonschema.Draft7Validator':
+    """
+    Check `schema` and build a validator that can be reused without compiling it again
+    """
+    import jsonschema
+
+    jsonschema.Draft7Validator.check_schema(schema)
+    return jsonschema.Draft7Validator(schema)
+
+
+class LazySchemaValidator:
+    """
+    Validator of `schema` compiled on first use, so jsonschema is only imported once something gets validated
+    """
+    def __init__(self, schema: Dict[str, Any]):
+        self.schema = schema
+        self.__validator = None
+
+    @property
+    def validator(self) -> 'jsonschema.Draft7Validator':
+        if self.__validator is None:
+            self.__validator = compile_schema(self.schema)
+        return self.__validator
+
+    def iter_errors(self, instance: Any) -> Iterator['jsonschema.ValidationError']:
+        return self.validator.iter_errors(instance)
+
+
+def validate(validator: Union['jsonschema.Draft7Validator', LazySchemaValidator], instance: Any):
+    """
+    Same as `jsonschema.validate`, but with a precompiled validator
+    """
+    from jsonschema.exceptions import best_match
+
+    error = best_match(validator.iter_errors(instance))
+    if error is not None:
+        raise error
+
+
+def get_decoder(cls: Type) -> Decoder:
+    """
+    Get the decoder for `cls`, compiling it on first use
+    """
+    try:
+        return _decoders[cls]
+    except KeyError:
+        decoder = _decoders[cls] = compile_decoder(cls)
+        return decoder
+
+
+def compile_decoder(cls: Type) -> Decoder:
+    """
+    Build a function checking a `data` dict against the init fields of dataclass `cls`.
+
+    The decoder raises `WrongPayloadError` on missing or unexpected fields, and on values whose JSON type does not match
+    the field annotation. Annotations that cannot come out of JSON (like `uuid4`) are not checked.
+    """
+    fields = [field for field in dataclasses.fields(cls) if field.init]
+    allowed = frozenset(field.name for field in fields)
+    required = frozenset(field.name for field in fields
+                         if field.default is dataclasses.MISSING and field.default_factory is dataclasses.MISSING)
+    checkers = []
+    for field in fields:
+        checker = compile_type_checker(field.type)
+        if checker is not None:
+            checkers.append((field.name, field.type, checker))
+
+    def decode(data: Dict[str, Any]) -> Dict[str, Any]:
+        keys = data.keys()
+        if keys != allowed:
+            missing = required - keys
+            if missing:
+                raise exceptions.WrongPayloadError(f'{cls.__name__} is missing {", ".join(sorted(missing))}')
+
+            unexpected = keys - allowed
+            if unexpected:
+                raise exceptions.WrongPayloadError(f'{cls.__name__} got unexpected {", ".join(sorted(unexpected))}')
+
+        for name, annotation, checker in checkers:
+            if name in data and not checker(data[name]):
+                raise exceptions.WrongPayloadError(f'{cls.__name__}.{name} must be {annotation}')
+
+        return data
+
+    return decode
+
+
+def compile_type_checker(annotation: Any) -> Optional[Checker]:
+    """
+    Build a predicate checking a loaded JSON value against `annotation`, or None when any value is acceptable
+    """
+    if annotation is Any:
+        return None
+    if annotation is type(None):
+        return lambda value: value is None
+    if annotation is bool:
+        return lambda value: value is True or value is False
+    if annotation is int:
+        return lambda value: isinstance(value, int) and not isinstance(value, bool)
+    if annotation is float:
+        return lambda value: isinstance(value, (int, float)) and not isinstance(value, bool)
+    if annotation is str:
+        return lambda value: isinstance(value, str)
+
+    origin = getattr(annotation, '__origin__', None) or annotation
+    if origin is Union:
+        options = [compile_type_checker(arg) for arg in annotation.__args__]
+        if None in options:
+            return None
+        return lambda value: any(option(value) for option in options)
+
+    origin = _CONTAINERS.get(origin)
+    args = getattr(annotation, '__args__', None) or ()
+    if origin is list:
+        item = compile_type_checker(args[0]) if args else None
+        if item is None:
+            return lambda value: isinstance(value, list)
+        return lambda value: isinstance(value, list) and all(item(v) for v in value)
+    if origin is dict:
+        item = compile_type_checker(args[1]) if len(args) == 2 else None
+        if item is None:
+            return lambda value: isinstance(value, dict)
+        return lambda value: isinstance(value, dict) and all(item(v) for v in value.values())
+
+    return None
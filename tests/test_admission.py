@@ -0,0 +1,137 @@
+import json
+import pytest
+
+from polyswarmtransaction import hashing, instrumentation
+from polyswarmtransaction.admission import SECP256K1_N, AdmissionFilter, read_head
+from polyswarmtransaction.bounty import VoteTransaction
+from polyswarmtransaction.exceptions import DisallowedSenderError, DisallowedTransactionError, InvalidSignatureError, \
+    MalformedSignatureError, MalformedTransactionError, OversizedTransactionError, WrongPayloadError
+from polyswarmtransaction.transaction import SignedTransaction, Signer, Transaction
+
+VOTE = 'polyswarmtransaction.bounty:VoteTransaction'
+
+
+@pytest.fixture
+def signed(ethereum_accounts):
+    return Signer(ethereum_accounts[0].key).sign(VoteTransaction('guid', True))
+
+
+@pytest.fixture
+def no_crypto(monkeypatch):
+    monkeypatch.setattr(hashing, 'keccak', pytest.fail)
+
+
+def test_admits(signed, ethereum_accounts):
+    admission = AdmissionFilter(name_prefixes=['polyswarmtransaction.'], allowed_senders=[ethereum_accounts[0].address])
+    admission.check(signed)
+    admission.check(SignedTransaction(signed.raw_transaction.encode(), signed.signature))
+    assert admission.admitted == 2
+    assert not admission.rejects
+
+
+def test_verify_runs_filter(signed, monkeypatch):
+    admission = AdmissionFilter(denied_senders=[])
+    monkeypatch.setattr(SignedTransaction, 'admission_filter', admission)
+    assert SignedTransaction(**signed.payload).verify().transaction == VoteTransaction('guid', True)
+    assert admission.admitted == 1
+
+
+@pytest.mark.parametrize('signature', [bytes(64), bytes(66), b'\x01' * 64 + b'\x1b', bytes(32) + b'\x01' * 32 + b'\x00',
+                                       b'\x01' * 32 + SECP256K1_N.to_bytes(32, 'big') + b'\x00'])
+def test_rejects_signature(signed, no_crypto, signature):
+    admission = AdmissionFilter()
+    with pytest.raises(MalformedSignatureError):
+        admission.check(SignedTransaction(signed.raw_transaction, signature))
+    assert admission.rejects == {'MalformedSignatureError': 1}
+
+
+def test_rejects_oversized(signed, no_crypto):
+    admission = AdmissionFilter(max_size=len(signed.raw_transaction) - 1)
+    with pytest.raises(OversizedTransactionError):
+        admission.check(signed)
+
+
+@pytest.mark.parametrize('name', ['polyswarmtransaction.nectar:WithdrawalTransaction', 'os:system', 'no_colon',
+                                  'too:many:colons'])
+def test_rejects_name(signed, no_crypto, name):
+    admission = AdmissionFilter(name_prefixes=['polyswarmtransaction.bounty:'])
+    raw_transaction = signed.raw_transaction.replace(VOTE, name)
+    with pytest.raises(DisallowedTransactionError):
+        admission.check(SignedTransaction(raw_transaction, signed.signature))
+
+
+def test_rejects_sender(signed, no_crypto, ethereum_accounts):
+    with pytest.raises(DisallowedSenderError):
+        AdmissionFilter(allowed_senders=[ethereum_accounts[1].address]).check(signed)
+    with pytest.raises(DisallowedSenderError):
+        AdmissionFilter(denied_senders=[ethereum_accounts[0].address.lower()]).check(signed)
+    AdmissionFilter(denied_senders=[ethereum_accounts[1].address]).check(signed)
+
+
+@pytest.mark.parametrize('key', ['"from"', '"fr\\u006fm"'])
+def test_duplicate_sender(ethereum_accounts, key):
+    signer = Signer(ethereum_accounts[1].key)
+    # Head claims account 0, the parsed body that verification checks keeps the last sender
+    message = signer.message(VoteTransaction('guid', True)).replace(signer.address, ethereum_accounts[0].address)
+    message = f'{message[:-1]}, {key}: "{signer.address}"}}'
+    signed = SignedTransaction(message, Transaction.sign_message(message, signer.private_key).to_bytes())
+    assert read_head(signed) == (VOTE, signer.address)
+    with pytest.raises(DisallowedSenderError):
+        AdmissionFilter(denied_senders=[signer.address]).check(signed)
+    with pytest.raises(DisallowedSenderError):
+        AdmissionFilter(allowed_senders=[ethereum_accounts[0].address]).check(signed)
+    assert signed.verify().sender == signer.address
+
+
+@pytest.mark.parametrize('key', ['"name"', '"n\\u0061me"'])
+def test_duplicate_name(signed, key):
+    raw_transaction = f'{signed.raw_transaction[:-1]}, {key}: "os:system"}}'
+    with pytest.raises(DisallowedTransactionError):
+        AdmissionFilter(name_prefixes=['polyswarmtransaction.bounty:']).check(SignedTransaction(raw_transaction,
+                                                                                                signed.signature))
+
+
+def test_reads_head_without_parsing(signed, monkeypatch):
+    monkeypatch.setattr(SignedTransaction, 'body', property(pytest.fail))
+    assert read_head(signed) == read_head(SignedTransaction(memoryview(signed.raw_transaction.encode()),
+                                                            signed.signature))
+
+
+def test_reads_other_layouts(signed, ethereum_accounts):
+    body = json.loads(signed.raw_transaction)
+    reordered = json.dumps({'data': body['data'], 'from': body['from'], 'name': body['name']}, separators=(',', ':'))
+    assert read_head(SignedTransaction(reordered, signed.signature)) == (VOTE, ethereum_accounts[0].address)
+    assert read_head(SignedTransaction(memoryview(reordered.encode()), signed.signature)) == \
+        (VOTE, ethereum_accounts[0].address)
+
+
+@pytest.mark.parametrize('raw_transaction', ['not json', '[]', '{"name": 1, "from": "0x"}', '{"from": "0x"}'])
+def test_rejects_malformed(signed, no_crypto, raw_transaction):
+    with pytest.raises(MalformedTransactionError):
+        AdmissionFilter(name_prefixes=['polyswarmtransaction.']).check(SignedTransaction(raw_transaction,
+                                                                                         signed.signature))
+
+
+def test_errors_extend_verification_errors():
+    assert issubclass(MalformedSignatureError, InvalidSignatureError)
+    assert issubclass(OversizedTransactionError, WrongPayloadError)
+    assert issubclass(MalformedTransactionError, WrongPayloadError)
+
+
+def test_admit_stage_is_instrumented(signed, monkeypatch):
+    events = []
+    monkeypatch.setattr(SignedTransaction, 'admission_filter', AdmissionFilter())
+    instrumentation.add_sink(events.append)
+    try:
+        SignedTransaction(**signed.payload).verify()
+    finally:
+        instrumentation.remove_sink(events.append)
+    assert list(events[0].stages)[0] == instrumentation.ADMIT
+
+
+def test_clear(signed):
+    admission = AdmissionFilter(max_size=1)
+    with pytest.raises(OversizedTransactionError):
+        admission.check(signed)
+    admission.clear()
+    assert not admission.rejects
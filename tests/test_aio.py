@@ -0,0 +1,65 @@
+import asyncio
+import pytest
+
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from polyswarmtransaction.aio import AsyncVerifier, averify_many
+from polyswarmtransaction.exceptions import WrongSignatureError
+from polyswarmtransaction.nectar import WithdrawalTransaction
+from polyswarmtransaction.transaction import SignedTransaction, Transaction
+
+
+@pytest.fixture
+def loop():
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    yield loop
+    loop.close()
+    asyncio.set_event_loop(None)
+
+
+def test_averify(loop, ethereum_accounts):
+    signed = WithdrawalTransaction('1').sign(ethereum_accounts[0].key)
+    verified = loop.run_until_complete(SignedTransaction(**signed.payload).averify())
+    assert verified.sender == ethereum_accounts[0].address
+    assert verified.transaction == WithdrawalTransaction('1')
+
+
+def test_averify_process_executor(loop, ethereum_accounts):
+    signed = WithdrawalTransaction('1').sign(ethereum_accounts[0].key)
+    with ProcessPoolExecutor(1) as executor:
+        verified = loop.run_until_complete(signed.averify(executor))
+    assert verified.sender == ethereum_accounts[0].address
+
+
+def test_averify_wrong_signature(loop, ethereum_accounts):
+    raw_transaction = Transaction().sign(ethereum_accounts[0].key).raw_transaction
+    signature = Transaction().sign(ethereum_accounts[1].key).signature
+    with pytest.raises(WrongSignatureError):
+        loop.run_until_complete(SignedTransaction(raw_transaction, signature).averify())
+
+
+def test_async_verifier_batches(loop, ethereum_accounts, monkeypatch):
+    from polyswarmtransaction import aio
+
+    batch_sizes = []
+    original_verify_chunk = aio.verify_chunk
+    monkeypatch.setattr(aio, 'verify_chunk',
+                        lambda chunk: batch_sizes.append(len(chunk)) or original_verify_chunk(chunk))
+
+    signed = [WithdrawalTransaction(str(i)).sign(ethereum_accounts[i % 3].key) for i in range(10)]
+    with ThreadPoolExecutor(2) as executor:
+        verifier = AsyncVerifier(executor, max_batch_size=4, max_concurrency=1)
+        results = loop.run_until_complete(verifier.verify_many(s.payload for s in signed))
+
+    assert sorted(batch_sizes) == [2, 4, 4]
+    assert [r.address for r in results] == [ethereum_accounts[i % 3].address for i in range(10)]
+    assert [r.transaction.amount for r in results] == [str(i) for i in range(10)]
+
+
+def test_averify_many(loop, ethereum_accounts):
+    payloads = [WithdrawalTransaction(str(i)).sign(ethereum_accounts[0].key).payload for i in range(3)]
+    payloads.append({'raw_transaction': payloads[0]['raw_transaction'], 'signature': payloads[1]['signature']})
+    results = loop.run_until_complete(averify_many(payloads))
+    assert [r.ok for r in results] == [True, True, True, False]
+    assert isinstance(results[3].error, WrongSignatureError)
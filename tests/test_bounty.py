@@ -1,4 +1,5 @@
 import json
+import pickle
 import pytest
 
 from deepdiff import DeepDiff
@@ -8,8 +9,11 @@ from web3 import Web3
 from polyswarmartifact import ArtifactType
 from polyswarmartifact.schema.bounty import Bounty as BountyMetadata
 from polyswarmartifact.schema.verdict import Verdict as VerdictMetadata, Scanner
+from polyswarmtransaction import bounty
+from polyswarmtransaction.cache import MetadataCache
+from polyswarmtransaction.exceptions import WrongPayloadError
 from polyswarmtransaction.transaction import SignedTransaction
-from polyswarmtransaction.bounty import BountyTransaction, AssertionTransaction, VoteTransaction
+from polyswarmtransaction.bounty import BountyTransaction, AssertionTransaction, VoteTransaction, deferred_validation
 
 
 BOUNTY_METADATA = json.loads(BountyMetadata().add_file_artifact(mimetype='').json())
@@ -148,6 +152,41 @@ def test_load_bounty_bad_artifact_type():
         assert signed.transaction()
 
 
+def test_load_bounty_wrong_duration_type():
+    data = {
+        'name': 'polyswarmtransaction.bounty:BountyTransaction',
+        'from': '0x3f17f1962B36e491b30A40b2405849e597Ba5FB5',
+        'data': {
+            'guid': 'test',
+            'reward': '2000000000000000000',
+            'artifact': 'Qm',
+            'artifact_type': 0,
+            'duration': '123',
+            'metadata': [{'mimetype': ''}]
+        }
+    }
+    signed = SignedTransaction(json.dumps(data), bytes([0] * 65))
+    with pytest.raises(WrongPayloadError):
+        assert signed.transaction()
+
+
+def test_load_bounty_missing_field():
+    data = {
+        'name': 'polyswarmtransaction.bounty:BountyTransaction',
+        'from': '0x3f17f1962B36e491b30A40b2405849e597Ba5FB5',
+        'data': {
+            'guid': 'test',
+            'reward': '2000000000000000000',
+            'artifact': 'Qm',
+            'artifact_type': 0,
+            'metadata': [{'mimetype': ''}]
+        }
+    }
+    signed = SignedTransaction(json.dumps(data), bytes([0] * 65))
+    with pytest.raises(WrongPayloadError):
+        assert signed.transaction()
+
+
 def test_recover_assertion_when_computed(ethereum_accounts):
     data = {
         'name': 'polyswarmtransaction.bounty:AssertionTransaction',
@@ -363,3 +402,103 @@ def test_load_vote():
     signed = SignedTransaction(json.dumps(data), bytes([0] * 65))
     assert isinstance(signed.transaction(), VoteTransaction)
     assert not DeepDiff(signed.transaction().data, VoteTransaction('test', True).data, ignore_order=True)
+
+
+def test_load_vote_wrong_vote_type():
+    data = {
+        'name': 'polyswarmtransaction.bounty:VoteTransaction',
+        'from': '0x3f17f1962B36e491b30A40b2405849e597Ba5FB5',
+        'data': {
+            'guid': 'test',
+            'vote': 1,
+        }
+    }
+    signed = SignedTransaction(json.dumps(data), bytes([0] * 65))
+    with pytest.raises(WrongPayloadError):
+        assert signed.transaction()
+
+
+def test_vote_is_slotted():
+    vote = VoteTransaction('guid', True)
+    assert not hasattr(vote, '__dict__')
+    assert pickle.loads(pickle.dumps(vote)) == vote
+
+
+@pytest.fixture
+def metadata_cache(monkeypatch):
+    cache = MetadataCache(maxsize=4)
+    monkeypatch.setattr(bounty, 'metadata_cache', cache)
+    return cache
+
+
+@pytest.fixture
+def validations(monkeypatch):
+    calls = []
+    validate = VerdictMetadata.validate
+
+    def counting_validate(metadata):
+        calls.append(metadata)
+        return validate(metadata)
+
+    monkeypatch.setattr(VerdictMetadata, 'validate', counting_validate)
+    return calls
+
+
+def test_metadata_validation_cached(metadata_cache, validations):
+    for _ in range(3):
+        AssertionTransaction('guid', True, '1000', json.loads(json.dumps(ASSERTION_METADATA)))
+    assert len(validations) == 1
+    assert metadata_cache.hits == 2
+
+
+def test_invalid_metadata_cached(metadata_cache, validations):
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            AssertionTransaction('guid', True, '1000', {'malware_family': 1})
+    assert len(validations) == 1
+
+
+def test_metadata_cache_keyed_by_schema(metadata_cache):
+    # Valid verdict metadata is not valid bounty metadata
+    AssertionTransaction('guid', True, '1000', ASSERTION_METADATA)
+    with pytest.raises(ValueError):
+        BountyTransaction('guid', '1000', 'Qm', ArtifactType.FILE.value, 123, ASSERTION_METADATA)
+
+
+def test_metadata_cache_disabled(monkeypatch, validations):
+    monkeypatch.setattr(bounty, 'metadata_cache', None)
+    for _ in range(2):
+        AssertionTransaction('guid', True, '1000', ASSERTION_METADATA)
+    assert len(validations) == 2
+
+
+def test_unserializable_metadata_not_cached(metadata_cache):
+    with pytest.raises(ValueError):
+        AssertionTransaction('guid', True, '1000', {'malware_family': object()})
+    assert len(metadata_cache) == 0
+
+
+def test_deferred_validation(monkeypatch, validations):
+    monkeypatch.setattr(bounty, 'metadata_cache', None)
+    with deferred_validation() as batch:
+        assertions = [AssertionTransaction(f'guid-{i}', True, '1000', dict(ASSERTION_METADATA)) for i in range(10)]
+        assert not validations
+        assert batch.pending == assertions
+
+    assert len(validations) == 1
+    assert batch.invalid == []
+
+
+def test_deferred_validation_invalid(metadata_cache):
+    with pytest.raises(ValueError):
+        with deferred_validation() as batch:
+            valid = AssertionTransaction('guid', True, '1000', ASSERTION_METADATA)
+            invalid = [AssertionTransaction('guid', True, '1000', {'malware_family': 1}) for _ in range(2)]
+            BountyTransaction('guid', '1000', 'Qm', ArtifactType.FILE.value, 123, BOUNTY_METADATA)
+
+    assert batch.invalid == invalid
+    assert valid not in batch.invalid
+
+    # Only deferred inside the block
+    with pytest.raises(ValueError):
+        AssertionTransaction('guid', True, '1000', {'malware_family': 1})
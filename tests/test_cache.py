@@ -0,0 +1,135 @@
+import pytest
+
+from eth_keys.datatypes import PublicKey
+
+from polyswarmtransaction.bounty import VoteTransaction
+from polyswarmtransaction.cache import KeyDirectory, LRUCache, RecoveryCache
+from polyswarmtransaction.exceptions import InvalidSignatureError, WrongSignatureError
+from polyswarmtransaction.transaction import BatchSignedTransaction, SignedTransaction, Signer, Transaction
+
+
+@pytest.fixture
+def recovery_cache(monkeypatch):
+    cache = RecoveryCache(maxsize=2)
+    monkeypatch.setattr(SignedTransaction, 'recovery_cache', cache)
+    return cache
+
+
+@pytest.fixture
+def key_directory(monkeypatch):
+    directory = KeyDirectory(maxsize=2)
+    monkeypatch.setattr(SignedTransaction, 'key_directory', directory)
+    return directory
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1
+    cache.put('c', 3)
+    assert 'b' not in cache
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+    assert (cache.hits, cache.misses, cache.evictions) == (3, 1, 1)
+    assert cache.hit_rate == 0.75
+
+
+def test_lru_clear():
+    cache = LRUCache(maxsize=2)
+    cache.put('a', 1)
+    cache.get('a')
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.hits == 0
+
+
+def test_lru_invalid_size():
+    with pytest.raises(ValueError):
+        LRUCache(maxsize=0)
+
+
+def test_duplicate_skips_recovery(ethereum_accounts, recovery_cache, monkeypatch):
+    signed = Transaction().sign(ethereum_accounts[0].key)
+    assert SignedTransaction(**signed.payload).ecrecover() == ethereum_accounts[0].address
+    assert recovery_cache.misses == 1
+
+    monkeypatch.setattr(PublicKey, 'recover_from_msg_hash', pytest.fail)
+    assert SignedTransaction(**signed.payload).ecrecover() == ethereum_accounts[0].address
+    assert recovery_cache.hits == 1
+
+
+def test_cache_keyed_by_message(ethereum_accounts, recovery_cache):
+    signed = Transaction().sign(ethereum_accounts[0].key)
+    signed.ecrecover()
+
+    # Same signature, but a message claiming another sender
+    raw_transaction = signed.raw_transaction.replace(ethereum_accounts[0].address, ethereum_accounts[1].address)
+    assert raw_transaction != signed.raw_transaction
+    with pytest.raises(WrongSignatureError):
+        SignedTransaction(raw_transaction, signed.signature).ecrecover()
+
+
+def test_known_sender_skips_recovery(ethereum_accounts, key_directory, monkeypatch):
+    signer = Signer(ethereum_accounts[0].key)
+    assert signer.sign(Transaction()).verify().sender == ethereum_accounts[0].address
+    assert key_directory.get_key(ethereum_accounts[0].address)[1] == ethereum_accounts[0].address
+
+    monkeypatch.setattr(PublicKey, 'recover_from_msg_hash', pytest.fail)
+    signed = signer.sign(VoteTransaction('guid', True))
+    assert SignedTransaction(**signed.payload).verify().sender == ethereum_accounts[0].address
+
+
+def test_preloaded_sender(ethereum_accounts, key_directory, monkeypatch):
+    key_directory.add(Signer(ethereum_accounts[1].key).public_key)
+    monkeypatch.setattr(PublicKey, 'recover_from_msg_hash', pytest.fail)
+    assert Transaction().sign(ethereum_accounts[1].key).ecrecover() == ethereum_accounts[1].address
+    assert key_directory.hits == 1
+
+
+def test_known_sender_wrong_signature(ethereum_accounts, key_directory):
+    key_directory.add(Signer(ethereum_accounts[0].key).public_key)
+    signed = Transaction().sign(ethereum_accounts[0].key)
+    forged = SignedTransaction(signed.raw_transaction, Transaction().sign(ethereum_accounts[1].key).signature)
+    with pytest.raises(WrongSignatureError):
+        forged.ecrecover()
+    # Only senders matching their claim are added
+    assert len(key_directory) == 1
+
+
+@pytest.mark.parametrize('known', [False, True])
+def test_flipped_recovery_id(ethereum_accounts, key_directory, monkeypatch, known):
+    signer = Signer(ethereum_accounts[0].key)
+    if known:
+        key_directory.add(signer.public_key)
+    else:
+        monkeypatch.setattr(SignedTransaction, 'key_directory', None)
+    signed = signer.sign(Transaction())
+    signature = bytes(signed.signature)
+    flipped = SignedTransaction(signed.raw_transaction, signature[:64] + bytes([signature[64] ^ 1]))
+    # Still a valid ECDSA signature of the message, but recovering another key
+    with pytest.raises((WrongSignatureError, InvalidSignatureError)):
+        flipped.ecrecover()
+
+
+def test_known_sender_not_checksummed(ethereum_accounts, key_directory):
+    signer = Signer(ethereum_accounts[0].key)
+    key_directory.add(signer.public_key)
+    message = signer.message(Transaction()).replace(signer.address, signer.address.lower())
+    signed = SignedTransaction(message, Transaction.sign_message(message, signer.private_key).to_bytes())
+    # Rejected like without the directory
+    with pytest.raises(WrongSignatureError):
+        signed.ecrecover()
+
+
+@pytest.mark.parametrize('address', [None, 1, '', '0x12', 'x' * 42, '0x' + 'z' * 40])
+def test_key_directory_invalid_address(key_directory, address):
+    assert key_directory.get_key(address) is None
+
+
+def test_batch_with_key_directory(ethereum_accounts, key_directory):
+    BatchSignedTransaction.recovery_cache.clear()
+    signed = Signer(ethereum_accounts[2].key).sign_batch([VoteTransaction(f'guid-{i}', True) for i in range(3)])
+    assert [batch_signed.verify().sender for batch_signed in signed] == [ethereum_accounts[2].address] * 3
+    assert key_directory.get_key(ethereum_accounts[2].address) is not None
@@ -0,0 +1,134 @@
+import json
+import math
+import pytest
+import tracemalloc
+
+from polyswarmtransaction import codec
+
+BACKENDS = [codec.BACKENDS[name] for name in codec.available_backends()]
+
+VALUES = [
+    None,
+    True,
+    False,
+    0,
+    -1,
+    2 ** 63 - 1,
+    -2 ** 63,
+    2 ** 64,
+    2 ** 70,
+    -2 ** 70,
+    1.0,
+    -0.0,
+    0.1,
+    1e-7,
+    1.7976931348623157e308,
+    5e-324,
+    '',
+    'ascii',
+    'é中 𝄞',
+    '"quoted" \\ / \b \f \n \r \t \x00 \x1f \x7f',
+    '\ud800 lone surrogate',
+    '2000000000000000000',
+    [],
+    {},
+    [1, [2, [3, [4, []]]]],
+    {'name': 'polyswarmtransaction.bounty:BountyTransaction', 'from': '0x3f17f1962B36e491b30A40b2405849e597Ba5FB5',
+     'data': {'guid': 'test', 'reward': '2000000000000000000', 'duration': 123, 'metadata': [{'mimetype': ''}]}},
+    {'nested': {'list': [None, 1.5, {'deep': ['value']}]}, 'unicode key é': 1},
+]
+
+DOCUMENTS = [
+    ' {"a" : 1 , "b":[ 1,2 ] }\n',
+    '{"a": 1, "a": 2}',
+    '18446744073709551615',
+    '18446744073709551616',
+    '-9223372036854775809',
+    '123456789012345678901234567890',
+    '[1E400, -1e400]',
+    'NaN',
+    '[Infinity, -Infinity]',
+    '"\\ud800"',
+    '"\\ud834\\udd1e"',
+    '1.0000000000000000000000001',
+    '0.30000000000000004',
+    '"19 digits 1234567890123456789"',
+]
+
+INVALID_DOCUMENTS = [
+    '',
+    'this is not json',
+    '{"a": 1,}',
+    '[1, 2',
+    "{'a': 1}",
+    '﻿{}',
+]
+
+
+def canonical(value):
+    # NaN never equals itself, compare the canonical text instead
+    return json.dumps(value)
+
+
+@pytest.mark.parametrize('value', VALUES, ids=repr)
+def test_dumps_matches_json(value):
+    assert codec.dumps(value) == json.dumps(value)
+
+
+@pytest.mark.parametrize('backend', BACKENDS, ids=lambda b: b.name)
+@pytest.mark.parametrize('value', VALUES, ids=repr)
+def test_loads_round_trip(backend, value):
+    document = json.dumps(value)
+    assert canonical(backend.loads(document)) == canonical(json.loads(document))
+    assert canonical(backend.loads(document.encode())) == canonical(json.loads(document))
+    assert canonical(backend.loads(memoryview(document.encode()))) == canonical(json.loads(document))
+
+
+@pytest.mark.parametrize('backend', BACKENDS, ids=lambda b: b.name)
+@pytest.mark.parametrize('document', DOCUMENTS, ids=repr)
+def test_loads_matches_json(backend, document):
+    loaded = backend.loads(document)
+    expected = json.loads(document)
+    assert canonical(loaded) == canonical(expected)
+    assert type(loaded) is type(expected)
+
+
+@pytest.mark.parametrize('backend', BACKENDS, ids=lambda b: b.name)
+@pytest.mark.parametrize('document', INVALID_DOCUMENTS, ids=repr)
+def test_loads_invalid(backend, document):
+    with pytest.raises(json.JSONDecodeError):
+        backend.loads(document)
+
+
+def test_loads_nan():
+    for backend in BACKENDS:
+        assert math.isnan(backend.loads('NaN'))
+
+
+def test_set_backend():
+    backend = codec.get_backend()
+    try:
+        codec.set_backend('json')
+        assert codec.get_backend() is codec.JSONBackend
+        with pytest.raises(ValueError):
+            codec.set_backend('nope')
+    finally:
+        codec.set_backend(backend.name)
+
+
+def test_default_backend_is_fastest_installed():
+    expected = 'orjson' if 'orjson' in codec.available_backends() else 'json'
+    assert codec.get_backend().name == expected
+
+
+@pytest.mark.skipif('orjson' not in codec.available_backends(), reason='orjson is not installed')
+@pytest.mark.parametrize('convert', [bytes, bytearray, memoryview], ids=lambda c: c.__name__)
+def test_orjson_parses_buffers_without_copy(convert):
+    data = convert(b'[1' + b' ' * (4 * 1024 * 1024) + b']')
+    tracemalloc.start()
+    try:
+        assert codec.OrjsonBackend.loads(data) == [1]
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    assert peak < 1024 * 1024
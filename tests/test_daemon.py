@@ -0,0 +1,120 @@
+import json
+import os
+import socket
+import stat
+import threading
+import pytest
+
+from click.testing import CliRunner
+
+from polyswarmtransaction.__main__ import main
+from polyswarmtransaction.daemon import SigningClient, SigningServer, remove_stale_socket
+from polyswarmtransaction.exceptions import WrongPayloadError
+from polyswarmtransaction.framing import pack_frame
+from polyswarmtransaction.transaction import CustomTransaction, Signer
+
+
+@pytest.fixture
+def socket_path(tmp_path):
+    return str(tmp_path / 'signer.sock')
+
+
+@pytest.fixture
+def server(ethereum_accounts, socket_path):
+    server = SigningServer(socket_path, Signer(ethereum_accounts[0].key))
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+def test_sign(server, socket_path, ethereum_accounts):
+    with SigningClient(socket_path) as client:
+        signed = client.sign('{"spam": "eggs"}')
+
+    expected = Signer(ethereum_accounts[0].key).sign(CustomTransaction(data_body='{"spam": "eggs"}'))
+    assert signed.payload == expected.payload
+    assert signed.verify().sender == ethereum_accounts[0].address
+
+
+def test_sign_many_pipelined(server, socket_path):
+    payloads = [json.dumps({'index': i, 'padding': 'x' * (i * 97)}) for i in range(200)]
+    with SigningClient(socket_path) as client:
+        signed = list(client.sign_many(payloads, window=16, window_bytes=4096))
+
+    assert [s.transaction().data for s in signed] == [json.loads(p) for p in payloads]
+
+
+def test_sign_error_keeps_connection(server, socket_path):
+    with SigningClient(socket_path) as client:
+        with pytest.raises(WrongPayloadError) as e:
+            client.sign('not json')
+        assert 'JSONDecodeError' in str(e.value)
+        assert client.sign('{}').transaction().data == {}
+
+
+def test_concurrent_clients(server, socket_path):
+    results = {}
+
+    def sign(index):
+        with SigningClient(socket_path) as client:
+            payloads = [json.dumps({'client': index, 'index': i}) for i in range(20)]
+            results[index] = [s.transaction().data for s in client.sign_many(payloads)]
+
+    threads = [threading.Thread(target=sign, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == {index: [{'client': index, 'index': i} for i in range(20)] for index in range(4)}
+
+
+def test_invalid_frame_closes_connection(server, socket_path):
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    connection.connect(socket_path)
+    connection.sendall(pack_frame(b'x' * (server.max_frame_size + 1))[:64])
+    connection.settimeout(5)
+    assert connection.recv(1) == b''
+    connection.close()
+
+
+def test_socket_is_private(server, socket_path):
+    assert stat.S_IMODE(os.stat(socket_path).st_mode) == 0o600
+
+
+def test_refuses_running_server(server, socket_path, ethereum_accounts):
+    with pytest.raises(FileExistsError):
+        SigningServer(socket_path, Signer(ethereum_accounts[0].key))
+
+
+def test_removes_stale_socket(socket_path):
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(socket_path)
+    stale.close()
+
+    remove_stale_socket(socket_path)
+    assert not os.path.exists(socket_path)
+
+
+def test_client_command(server, socket_path, ethereum_accounts):
+    stdin = '{"index": 0}\n\n{"index": 1}\n'
+    result = CliRunner().invoke(main, ['client', '--socket', socket_path, '--stream'], input=stdin)
+    assert result.exit_code == 0, result.output
+
+    lines = result.output.splitlines()
+    assert [json.loads(json.loads(line)['raw_transaction'])['data'] for line in lines] == [{'index': 0}, {'index': 1}]
+
+
+def test_client_command_invalid_payload(server, socket_path):
+    result = CliRunner().invoke(main, ['client', '--socket', socket_path], input='not json')
+    assert result.exit_code == 1
+    assert 'could not be signed' in result.output
+
+
+def test_client_command_no_daemon(socket_path):
+    result = CliRunner().invoke(main, ['client', '--socket', socket_path], input='{}')
+    assert result.exit_code == 1
+    assert 'Cannot connect' in result.output
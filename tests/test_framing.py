@@ -0,0 +1,89 @@
+import io
+import pickle
+import pytest
+
+from polyswarmtransaction.bounty import VoteTransaction
+from polyswarmtransaction.exceptions import InvalidFrameError, InvalidSignatureError
+from polyswarmtransaction.framing import FrameReader, FrameWriter, pack_frame
+from polyswarmtransaction.transaction import SignedTransaction, Signer
+
+
+class TrickleStream(io.BytesIO):
+    """
+    Returns at most 3 bytes per read, like a slow socket
+    """
+    def read(self, size=-1):
+        return super().read(min(size, 3) if size >= 0 else 3)
+
+
+@pytest.fixture
+def signed(ethereum_accounts):
+    return Signer(ethereum_accounts[0].key).sign_many(VoteTransaction(f'guid-{i}', i % 2 == 0) for i in range(5))
+
+
+def test_encode_decode(signed, ethereum_accounts):
+    encoded = signed[0].encode()
+    assert len(encoded) == 1 + 65 + len(signed[0].raw_transaction)
+
+    decoded = SignedTransaction.decode(encoded)
+    assert isinstance(decoded.raw_transaction, memoryview)
+    assert decoded.payload == signed[0].payload
+    assert decoded.verify().sender == ethereum_accounts[0].address
+
+
+def test_encode_keeps_message():
+    unicode = Signer(bytes([1] * 32)).sign(VoteTransaction('é中 𝄞', True))
+    decoded = SignedTransaction.decode(bytearray(unicode.encode()))
+    assert decoded.payload == unicode.payload
+    assert decoded.message_hash == unicode.message_hash
+
+
+def test_decode_invalid():
+    with pytest.raises(InvalidFrameError):
+        SignedTransaction.decode(b'\x01' + bytes(65))
+    with pytest.raises(InvalidFrameError):
+        SignedTransaction.decode(b'\x02' + bytes(65) + b'{}')
+
+
+def test_encode_invalid_signature():
+    with pytest.raises(InvalidSignatureError):
+        SignedTransaction('{}', bytes(64)).encode()
+
+
+def test_decoded_pickles(signed):
+    decoded = SignedTransaction.decode(signed[0].encode())
+    assert pickle.loads(pickle.dumps(decoded)).payload == signed[0].payload
+
+
+def test_frames_round_trip(signed):
+    stream = io.BytesIO()
+    FrameWriter(stream).write_many(signed)
+    stream.seek(0)
+    assert [frame.payload for frame in FrameReader(stream)] == [transaction.payload for transaction in signed]
+
+
+def test_frames_short_reads(signed):
+    stream = TrickleStream(b''.join(pack_frame(transaction.encode()) for transaction in signed))
+    assert [frame.payload for frame in FrameReader(stream)] == [transaction.payload for transaction in signed]
+
+
+def test_truncated_frame(signed):
+    stream = io.BytesIO(pack_frame(signed[0].encode())[:-1])
+    with pytest.raises(InvalidFrameError):
+        FrameReader(stream).read()
+
+
+def test_truncated_header():
+    with pytest.raises(InvalidFrameError):
+        FrameReader(io.BytesIO(b'\x00\x00')).read_frame()
+
+
+def test_frame_too_large(signed):
+    stream = io.BytesIO(pack_frame(signed[0].encode()))
+    with pytest.raises(InvalidFrameError):
+        FrameReader(stream, max_frame_size=64).read()
+
+
+def test_empty_stream():
+    assert FrameReader(io.BytesIO()).read() is None
+    assert list(FrameReader(io.BytesIO())) == []
@@ -0,0 +1,31 @@
+import pytest
+
+from web3 import Web3
+
+from polyswarmtransaction import hashing
+
+MESSAGES = ['', 'ascii', 'é中 𝄞', '{"name": "polyswarmtransaction.transaction:Transaction"}' * 100]
+
+
+@pytest.mark.parametrize('message', MESSAGES, ids=repr)
+def test_keccak_matches_web3(message):
+    expected = bytes(Web3.keccak(text=message))
+    encoded = message.encode()
+    assert hashing.keccak(message) == expected
+    assert hashing.keccak(encoded) == expected
+    assert hashing.keccak(bytearray(encoded)) == expected
+    assert hashing.keccak(memoryview(encoded)) == expected
+
+
+def test_keccak_without_cryptodome(monkeypatch):
+    monkeypatch.setattr(hashing, '_keccak', hashing.eth_hash_keccak)
+    assert hashing.keccak(memoryview(b'abc')) == bytes(Web3.keccak(b'abc'))
+
+
+@pytest.mark.parametrize('new_keccak', [hashing.new_keccak, hashing.BufferedKeccak], ids=['default', 'eth_hash'])
+def test_incremental_keccak(new_keccak):
+    message = MESSAGES[-1].encode()
+    hasher = new_keccak()
+    for start in range(0, len(message), 1000):
+        hasher.update(memoryview(message)[start:start + 1000])
+    assert hasher.digest() == hashing.keccak(message)
@@ -0,0 +1,109 @@
+import pytest
+
+from polyswarmtransaction import instrumentation
+from polyswarmtransaction.bounty import VoteTransaction
+from polyswarmtransaction.exceptions import WrongSignatureError
+from polyswarmtransaction.instrumentation import Histogram, HistogramAggregator
+from polyswarmtransaction.transaction import SignedTransaction, Signer
+
+VOTE_NAME = 'polyswarmtransaction.bounty:VoteTransaction'
+
+
+@pytest.fixture
+def events():
+    recorded = []
+    instrumentation.add_sink(recorded.append)
+    yield recorded
+    instrumentation.remove_sink(recorded.append)
+
+
+def test_sign_event(ethereum_accounts, events):
+    signed = Signer(ethereum_accounts[0].key).sign(VoteTransaction('guid', True))
+    event, = events
+    assert event.operation == instrumentation.SIGN
+    assert event.name == VOTE_NAME
+    assert event.size == len(signed.raw_transaction)
+    assert list(event.stages) == [instrumentation.SERIALIZE, instrumentation.HASH, instrumentation.SIGNATURE]
+    assert event.outcome == 'ok'
+    assert event.duration >= sum(event.stages.values())
+
+
+def test_verify_event(ethereum_accounts, events):
+    signed = VoteTransaction('guid', True).sign(ethereum_accounts[0].key)
+    verified = SignedTransaction(**signed.payload).verify()
+    assert verified.sender == ethereum_accounts[0].address
+    assert verified.transaction == VoteTransaction('guid', True)
+
+    event = events[-1]
+    assert event.operation == instrumentation.VERIFY
+    assert event.name == VOTE_NAME
+    assert event.size == len(signed.raw_transaction)
+    assert list(event.stages) == [instrumentation.HASH, instrumentation.RECOVER, instrumentation.PARSE,
+                                  instrumentation.VALIDATE, instrumentation.LOOKUP, instrumentation.DECODE]
+    assert event.error is None
+
+
+def test_verify_error_event(ethereum_accounts, events):
+    signed = VoteTransaction('guid', True).sign(ethereum_accounts[0].key)
+    signature = VoteTransaction('guid', True).sign(ethereum_accounts[1].key).signature
+    with pytest.raises(WrongSignatureError):
+        SignedTransaction(signed.raw_transaction, signature).verify()
+
+    event = events[-1]
+    assert event.name is None
+    assert event.outcome == 'WrongSignatureError'
+    assert list(event.stages) == [instrumentation.HASH, instrumentation.RECOVER]
+
+
+def test_no_sink_skips_timing(ethereum_accounts, monkeypatch):
+    monkeypatch.setattr(instrumentation, 'Timer', pytest.fail)
+    signed = VoteTransaction('guid', True).sign(ethereum_accounts[0].key)
+    assert SignedTransaction(**signed.payload).verify().sender == ethereum_accounts[0].address
+
+
+def test_remove_sink(ethereum_accounts, events):
+    instrumentation.remove_sink(events.append)
+    VoteTransaction('guid', True).sign(ethereum_accounts[0].key)
+    assert not events
+    assert not instrumentation.sinks
+
+
+def test_histogram_percentiles():
+    histogram = Histogram()
+    for i in range(1, 1001):
+        histogram.add(i / 1000)
+
+    assert histogram.count == 1000
+    assert histogram.mean == pytest.approx(0.5005)
+    for fraction in (0.5, 0.9, 0.99):
+        assert histogram.percentile(fraction) == pytest.approx(fraction, rel=histogram.growth - 1)
+    assert histogram.percentile(1) == 1
+
+
+def test_histogram_empty():
+    assert Histogram().summary()['p99'] == 0
+
+
+def test_aggregator(ethereum_accounts):
+    aggregator = HistogramAggregator()
+    instrumentation.add_sink(aggregator)
+    try:
+        signer = Signer(ethereum_accounts[0].key)
+        for signed in signer.sign_many([VoteTransaction('guid', True)] * 3):
+            signed.verify()
+        signature = Signer(ethereum_accounts[1].key).sign(VoteTransaction('guid', True)).signature
+        with pytest.raises(WrongSignatureError):
+            SignedTransaction(signed.raw_transaction, signature).verify()
+    finally:
+        instrumentation.remove_sink(aggregator)
+
+    summary = {(entry['operation'], entry['name']): entry for entry in aggregator.summary()}
+    assert summary[(instrumentation.SIGN, VOTE_NAME)]['outcomes'] == {'ok': 4}
+    verify = summary[(instrumentation.VERIFY, VOTE_NAME)]
+    assert verify['outcomes'] == {'ok': 3}
+    assert verify['stages'][instrumentation.TOTAL]['count'] == 3
+    assert verify['size']['max'] == len(signed.raw_transaction)
+    assert summary[(instrumentation.VERIFY, None)]['outcomes'] == {'WrongSignatureError': 1}
+
+    aggregator.clear()
+    assert aggregator.summary() == []
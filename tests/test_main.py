@@ -0,0 +1,73 @@
+import json
+import pytest
+
+from click.testing import CliRunner
+from web3.auto import w3
+
+from polyswarmtransaction.__main__ import main
+from polyswarmtransaction.transaction import SignedTransaction, CustomTransaction
+
+
+@pytest.fixture
+def keyfile(ethereum_accounts, tmp_path):
+    path = tmp_path / 'keyfile'
+    path.write_text(json.dumps(w3.eth.account.encrypt(ethereum_accounts[0].key, 'password', kdf='pbkdf2',
+                                                      iterations=1)))
+    return str(path)
+
+
+def test_sign_payload(keyfile, ethereum_accounts):
+    result = CliRunner().invoke(main, [keyfile, '-p', 'password'], input='"DEADBEEF"')
+    assert result.exit_code == 0, result.output
+    signed = SignedTransaction(**json.loads(result.output))
+    assert signed.ecrecover() == ethereum_accounts[0].address
+    assert json.loads(signed.raw_transaction)['data'] == 'DEADBEEF'
+
+
+@pytest.mark.parametrize('workers', ['1', '2'])
+def test_sign_stream(keyfile, ethereum_accounts, workers):
+    payloads = [{'index': i} for i in range(10)]
+    stdin = '\n'.join(json.dumps(p) for p in payloads[:5]) + '\n\n' + '\n'.join(json.dumps(p) for p in payloads[5:])
+
+    result = CliRunner().invoke(main, [keyfile, '-p', 'password', '--stream', '--workers', workers], input=stdin)
+
+    assert result.exit_code == 0, result.output
+    lines = result.output.splitlines()
+    assert len(lines) == 10
+    for line, payload in zip(lines, payloads):
+        signed = SignedTransaction(**json.loads(line))
+        assert signed.ecrecover() == ethereum_accounts[0].address
+        transaction = signed.transaction()
+        assert isinstance(transaction, CustomTransaction)
+        assert transaction.data == payload
+
+
+def test_sign_stream_invalid_json(keyfile):
+    result = CliRunner().invoke(main, [keyfile, '-p', 'password', '--stream'], input='{"a": 1}\nnot json\n')
+    assert result.exit_code == 1
+    assert 'not valid JSON' in result.output
+
+
+def test_verify(ethereum_accounts, tmp_path):
+    signed = [CustomTransaction(data_body=json.dumps({'index': i})).sign(ethereum_accounts[0].key) for i in range(5)]
+    lines = [json.dumps(s.payload) for s in signed]
+    lines[1] = json.dumps({'raw_transaction': signed[1].raw_transaction, 'signature': signed[2].signature.hex()})
+    lines[3] = 'not json'
+    path = tmp_path / 'payloads.ndjson'
+    path.write_text('\n'.join(lines[:2]) + '\n\n' + '\n'.join(lines[2:]) + '\n')
+
+    result = CliRunner(mix_stderr=False).invoke(main, ['verify', '--input', str(path), '--workers', '2',
+                                                       '--chunksize', '2'])
+
+    assert result.exit_code == 0, result.stderr
+    records = [json.loads(line) for line in result.stdout.splitlines()]
+    assert [r['line'] for r in records] == [1, 2, 4, 5, 6]
+    assert records[0] == {'line': 1, 'address': ethereum_accounts[0].address,
+                          'name': 'polyswarmtransaction.transaction:CustomTransaction'}
+    assert records[1]['error'] == 'WrongSignatureError'
+    assert records[3]['error'] == 'WrongPayloadError'
+
+    summary = json.loads(result.stderr)
+    assert summary['total'] == 5
+    assert summary['valid'] == 3
+    assert summary['errors'] == {'WrongSignatureError': 1, 'WrongPayloadError': 1}
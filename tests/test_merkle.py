@@ -0,0 +1,143 @@
+import json
+import pickle
+import pytest
+
+from eth_keys.datatypes import PublicKey
+
+from polyswarmtransaction import merkle
+from polyswarmtransaction.bounty import VoteTransaction
+from polyswarmtransaction.exceptions import InvalidSignatureError, WrongPayloadError, WrongSignatureError
+from polyswarmtransaction.parallel import verify_payload
+from polyswarmtransaction.transaction import BatchSignedTransaction, SignedTransaction, Signer, Transaction
+
+
+@pytest.fixture
+def recoveries(monkeypatch):
+    BatchSignedTransaction.recovery_cache.clear()
+    calls = []
+    recover = PublicKey.recover_from_msg_hash
+
+    def counting_recover(message_hash, signature, **kwargs):
+        calls.append(message_hash)
+        return recover(message_hash, signature, **kwargs)
+
+    monkeypatch.setattr(PublicKey, 'recover_from_msg_hash', counting_recover)
+    return calls
+
+
+def votes(count):
+    return [VoteTransaction(f'guid-{i}', i % 2 == 0) for i in range(count)]
+
+
+@pytest.mark.parametrize('size', range(1, 10))
+def test_proofs(size):
+    leaves = [merkle.leaf_hash(f'message {i}') for i in range(size)]
+    tree = merkle.MerkleTree(leaves)
+    for index, leaf in enumerate(leaves):
+        assert merkle.compute_root(leaf, index, size, tree.proof(index)) == tree.root
+
+
+def test_invalid_proofs():
+    leaves = [merkle.leaf_hash(f'message {i}') for i in range(5)]
+    tree = merkle.MerkleTree(leaves)
+    proof = tree.proof(2)
+    assert merkle.compute_root(leaves[2], 3, 5, proof) != tree.root
+    for index, size, invalid in ((2, 5, proof[:-1]), (2, 5, proof + [bytes(32)]), (2, 5, [b'short'] + proof[1:]),
+                                 (5, 5, proof), (-1, 5, proof)):
+        with pytest.raises(ValueError):
+            merkle.compute_root(leaves[2], index, size, invalid)
+
+
+def test_odd_node_is_not_duplicated():
+    # Pairing the odd leaf with itself would let [a, b, c] and [a, b, c, c] share a root
+    leaves = [merkle.leaf_hash(message) for message in 'abc']
+    assert merkle.MerkleTree(leaves).root != merkle.MerkleTree(leaves + leaves[-1:]).root
+
+
+def test_empty_tree():
+    with pytest.raises(ValueError):
+        merkle.MerkleTree([])
+
+
+def test_sign_batch(ethereum_accounts, recoveries):
+    transactions = votes(5)
+    signed = Signer(ethereum_accounts[0].key).sign_batch(transactions)
+    assert len({transaction.signature for transaction in signed}) == 1
+    for transaction, batch_signed in zip(transactions, signed):
+        verified = batch_signed.verify()
+        assert verified.sender == ethereum_accounts[0].address
+        assert verified.transaction == transaction
+
+    assert len(recoveries) == 1
+
+
+def test_sign_batch_message_unchanged(ethereum_accounts):
+    signer = Signer(ethereum_accounts[0].key)
+    signed = Transaction.sign_batch(votes(3), ethereum_accounts[0].key)
+    assert [batch_signed.raw_transaction for batch_signed in signed] == [signer.message(vote) for vote in votes(3)]
+
+
+def test_sign_empty_batch(ethereum_accounts):
+    assert Signer(ethereum_accounts[0].key).sign_batch([]) == []
+
+
+def test_batch_payload_round_trip(ethereum_accounts):
+    signed = Signer(ethereum_accounts[0].key).sign_batch(votes(3))[1]
+    loaded = SignedTransaction.from_payload(json.loads(json.dumps(signed.payload)))
+    assert isinstance(loaded, BatchSignedTransaction)
+    assert loaded.payload == signed.payload
+    assert loaded.verify().sender == ethereum_accounts[0].address
+    assert verify_payload(signed.payload).address == ethereum_accounts[0].address
+
+
+def test_batch_encode_decode(ethereum_accounts):
+    signed = Signer(ethereum_accounts[0].key).sign_batch(votes(3))[2]
+    decoded = SignedTransaction.decode(signed.encode())
+    assert isinstance(decoded, BatchSignedTransaction)
+    assert decoded.payload == signed.payload
+    assert decoded.verify().sender == ethereum_accounts[0].address
+
+    unpickled = pickle.loads(pickle.dumps(decoded))
+    assert unpickled.payload == signed.payload
+
+
+def test_batch_changed_message(ethereum_accounts):
+    first, second = Signer(ethereum_accounts[0].key).sign_batch(votes(2))
+    forged = BatchSignedTransaction(second.raw_transaction, first.signature, first.index, first.size, first.proof)
+    with pytest.raises(WrongSignatureError):
+        forged.verify()
+
+
+def test_batch_invalid_proof(ethereum_accounts):
+    signed = Signer(ethereum_accounts[0].key).sign_batch(votes(2))[0]
+    with pytest.raises(InvalidSignatureError):
+        BatchSignedTransaction(signed.raw_transaction, signed.signature, 0, 2, []).verify()
+
+
+@pytest.mark.parametrize('index, size', [(0.0, 2), (0, 2.0), (False, 2), (0, True), ('0', 2), (0, None)])
+def test_batch_index_and_size_types(ethereum_accounts, index, size):
+    signed = Signer(ethereum_accounts[0].key).sign_batch(votes(2))[0]
+    payload = dict(signed.payload, index=index, size=size)
+    with pytest.raises(WrongPayloadError):
+        SignedTransaction.from_payload(payload)
+    assert verify_payload(payload).error.__class__ is WrongPayloadError
+
+
+def test_single_signature_is_not_a_batch_signature(ethereum_accounts):
+    single = Signer(ethereum_accounts[0].key).sign(votes(1)[0])
+    with pytest.raises(WrongSignatureError):
+        BatchSignedTransaction(single.raw_transaction, single.signature, 0, 1, []).verify()
+
+    batch_signed, = Signer(ethereum_accounts[0].key).sign_batch(votes(1))
+    with pytest.raises(WrongSignatureError):
+        SignedTransaction(batch_signed.raw_transaction, batch_signed.signature).verify()
+
+
+def test_batch_set_raw_transaction(ethereum_accounts):
+    first, second = Signer(ethereum_accounts[0].key).sign_batch(votes(2))
+    assert first.verify().sender == ethereum_accounts[0].address
+    first.raw_transaction = second.raw_transaction
+    with pytest.raises(WrongSignatureError):
+        first.verify()
+    with pytest.raises(AttributeError):
+        first.index = 1
@@ -1,4 +1,5 @@
 import json
+import pickle
 
 from deepdiff import DeepDiff
 from eth_keys.datatypes import PrivateKey
@@ -182,3 +183,9 @@ def test_load_withdrawal():
     signed = SignedTransaction(json.dumps(data), bytes([0] * 65))
     assert isinstance(signed.transaction(), WithdrawalTransaction)
     assert not DeepDiff(signed.transaction().data, WithdrawalTransaction('200000000000000000').data, ignore_order=True)
+
+
+def test_withdrawal_is_slotted():
+    withdrawal = WithdrawalTransaction('200000000000000000')
+    assert not hasattr(withdrawal, '__dict__')
+    assert pickle.loads(pickle.dumps(withdrawal)) == withdrawal
@@ -0,0 +1,95 @@
+import json
+import pytest
+
+from polyswarmtransaction.exceptions import WrongPayloadError, WrongSignatureError, InvalidSignatureError, \
+    UnsupportedTransactionError
+from polyswarmtransaction.nectar import WithdrawalTransaction
+from polyswarmtransaction.parallel import VerificationPool, verify_many, verify_payload
+from polyswarmtransaction.transaction import SignedTransaction, Signer, Transaction, transaction_name
+
+
+@pytest.fixture(scope='module')
+def pool():
+    with VerificationPool(workers=2) as pool:
+        yield pool
+
+
+def test_verify_payload(ethereum_accounts):
+    signed = WithdrawalTransaction('2000000000000000000').sign(ethereum_accounts[0].key)
+    result = verify_payload(signed.payload)
+    assert result.ok
+    assert result.address == '0x3f17f1962B36e491b30A40b2405849e597Ba5FB5'
+    assert result.transaction == WithdrawalTransaction('2000000000000000000')
+
+
+def test_verify_payload_wrong_signature(ethereum_accounts):
+    raw_transaction = Transaction().sign(ethereum_accounts[0].key).raw_transaction
+    signature = Transaction().sign(ethereum_accounts[1].key).signature
+    result = verify_payload(SignedTransaction(raw_transaction, signature))
+    assert not result.ok
+    assert isinstance(result.error, WrongSignatureError)
+
+
+def test_verify_payload_not_json():
+    result = verify_payload({'raw_transaction': 'this is not json', 'signature': bytes([0] * 65).hex()})
+    assert isinstance(result.error, InvalidSignatureError)
+
+
+def test_verify_payload_missing_from(ethereum_accounts):
+    signed = Transaction().sign(ethereum_accounts[0].key)
+    body = json.loads(signed.raw_transaction)
+    del body['from']
+    result = verify_payload({'raw_transaction': json.dumps(body), 'signature': signed.signature.hex()})
+    assert isinstance(result.error, WrongPayloadError)
+
+
+def test_verify_payload_deeply_nested(ethereum_accounts):
+    private_key = Signer(ethereum_accounts[0].key).private_key
+    raw_transaction = '[' * 100000
+    signed = SignedTransaction(raw_transaction, Transaction.sign_message(raw_transaction, private_key).to_bytes())
+    result = verify_payload(signed.payload)
+    assert isinstance(result.error, WrongPayloadError)
+    assert 'RecursionError' in str(result.error)
+
+
+def test_verify_payload_missing_package(ethereum_accounts):
+    signer = Signer(ethereum_accounts[0].key)
+    raw_transaction = signer.message(Transaction()).replace(transaction_name(Transaction), 'nonexistent.sub:Foo')
+    signature = Transaction.sign_message(raw_transaction, signer.private_key).to_bytes()
+    result = verify_payload(SignedTransaction(raw_transaction, signature).payload)
+    assert isinstance(result.error, UnsupportedTransactionError)
+
+
+def test_verify_payload_unexpected_error(ethereum_accounts, monkeypatch):
+    signed = Transaction().sign(ethereum_accounts[0].key)
+    monkeypatch.setattr(SignedTransaction, 'verify', lambda self: [][0])
+    result = verify_payload(signed.payload)
+    assert isinstance(result.error, WrongPayloadError)
+    assert 'IndexError' in str(result.error)
+
+
+def test_verify_many_keeps_order(ethereum_accounts, pool):
+    signed = [WithdrawalTransaction(str(i)).sign(ethereum_accounts[i % 3].key) for i in range(20)]
+    payloads = [s.payload for s in signed]
+    payloads[7] = {'raw_transaction': signed[7].raw_transaction, 'signature': signed[8].signature.hex()}
+
+    results = verify_many(payloads, pool=pool, chunksize=3)
+
+    assert len(results) == 20
+    assert isinstance(results[7].error, WrongSignatureError)
+    for i, result in enumerate(results):
+        if i == 7:
+            continue
+        assert result.address == ethereum_accounts[i % 3].address
+        assert result.transaction == WithdrawalTransaction(str(i))
+
+
+def test_verify_many_accepts_signed_transactions(ethereum_accounts, pool):
+    signed = [WithdrawalTransaction(str(i)).sign(ethereum_accounts[0].key) for i in range(3)]
+    assert all(result.ok for result in pool.verify_many(signed))
+
+
+def test_verify_many_inline(ethereum_accounts):
+    signed = [WithdrawalTransaction(str(i)).sign(ethereum_accounts[0].key) for i in range(3)]
+    results = verify_many((s.payload for s in signed), workers=0)
+    assert [r.transaction.amount for r in results] == ['0', '1', '2']
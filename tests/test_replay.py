@@ -0,0 +1,82 @@
+import os
+import pytest
+
+from web3 import Web3
+
+from polyswarmtransaction.exceptions import ReplayedTransactionError
+from polyswarmtransaction.nectar import WithdrawalTransaction
+from polyswarmtransaction.replay import BloomFilter, ReplayDetector
+from polyswarmtransaction.transaction import SignedTransaction
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_tx_hash(ethereum_accounts):
+    signed = WithdrawalTransaction('1').sign(ethereum_accounts[0].key)
+    assert signed.tx_hash == Web3.keccak(text=signed.raw_transaction)
+
+
+def test_bloom_filter():
+    bloom_filter = BloomFilter(1000, 0.01)
+    digests = [os.urandom(32) for _ in range(1000)]
+    for digest in digests:
+        bloom_filter.add(digest)
+
+    assert all(digest in bloom_filter for digest in digests)
+    false_positives = sum(os.urandom(32) in bloom_filter for _ in range(10000))
+    assert false_positives < 300
+    assert bloom_filter.false_positive_rate == pytest.approx(0.01, rel=0.2)
+
+
+def test_detects_replay(ethereum_accounts):
+    detector = ReplayDetector(capacity=1000)
+    signed = WithdrawalTransaction('1').sign(ethereum_accounts[0].key)
+    detector.check(signed)
+    with pytest.raises(ReplayedTransactionError):
+        detector.check(SignedTransaction(**signed.payload))
+    detector.check(WithdrawalTransaction('2').sign(ethereum_accounts[0].key))
+
+
+def test_remembers_past_exact_set():
+    detector = ReplayDetector(capacity=1000, recent_size=1)
+    digests = [os.urandom(32) for _ in range(100)]
+    assert not any(detector.is_replay(digest) for digest in digests)
+    assert all(detector.is_replay(digest) for digest in digests)
+
+
+def test_forgets_after_window():
+    clock = Clock()
+    detector = ReplayDetector(window=100, capacity=1000, generations=4, recent_size=1, clock=clock)
+    digest = os.urandom(32)
+    assert not detector.is_replay(digest)
+
+    clock.now = 99
+    detector.is_replay(os.urandom(32))
+    assert detector.is_replay(digest)
+
+    clock.now = 130
+    detector.is_replay(os.urandom(32))
+    assert not detector.is_replay(digest)
+
+
+def test_memory_is_fixed():
+    detector = ReplayDetector(capacity=1000, recent_size=10)
+    size = detector.memory_size
+    for _ in range(5000):
+        detector.is_replay(os.urandom(32))
+    assert detector.memory_size == size
+
+
+def test_burst_within_capacity():
+    clock = Clock()
+    detector = ReplayDetector(window=3600, capacity=20000, error_rate=1e-3, generations=4, recent_size=1, clock=clock)
+    # The whole capacity arrives within the first generation
+    false_positives = sum(detector.is_replay(os.urandom(32)) for _ in range(20000))
+    assert false_positives < 60
+    assert detector.false_positive_rate <= 1e-3
@@ -0,0 +1,106 @@
+import dataclasses
+import json
+import pytest
+
+from typing import Any, Dict, List
+
+from polyswarmartifact.schema.bounty import Bounty as BountyMetadata
+from polyswarmartifact.schema.verdict import Verdict as VerdictMetadata
+from polyswarmtransaction.bounty import BountyTransaction, AssertionTransaction, VoteTransaction
+from polyswarmtransaction.nectar import WithdrawalTransaction, ApproveNectarReleaseTransaction
+from polyswarmtransaction.serialization import compile_serializer, get_serializer
+from polyswarmtransaction.transaction import CustomTransaction, Signer, Transaction, transaction_name
+
+
+def bounty_metadata(artifacts: int) -> List[Dict[str, Any]]:
+    metadata = BountyMetadata()
+    for i in range(artifacts):
+        metadata.add_file_artifact(mimetype='application/octet-stream', filename=f'file-{i}.exe', filesize=i + 1,
+                                   sha256='a' * 64, sha1='b' * 40, md5='c' * 32)
+    return json.loads(metadata.json())
+
+
+def verdict_metadata(scanners: int) -> Dict[str, Any]:
+    metadata = VerdictMetadata().set_malware_family('Eicar').set_scanner(operating_system='Linux',
+                                                                         architecture='x86_64',
+                                                                         version='1.0.0',
+                                                                         vendor_version='2.0')
+    loaded = json.loads(metadata.json())
+    loaded['scanner']['signatures'] = [f'signature-{i}' for i in range(scanners)]
+    return loaded
+
+
+@dataclasses.dataclass
+class Point:
+    x: float
+    y: float
+
+
+@dataclasses.dataclass
+class OddTransaction(Transaction):
+    text: str
+    number: float
+    nothing: Any
+    items: tuple
+    point: Point
+    points: List[Point]
+    mapping: Dict[Any, Any]
+
+
+@dataclasses.dataclass
+class EmptyTransaction(Transaction):
+    pass
+
+
+@dataclasses.dataclass
+class SingleFieldTransaction(Transaction):
+    value: str
+
+
+TRANSACTIONS = [
+    Transaction(),
+    EmptyTransaction(),
+    SingleFieldTransaction('only'),
+    BountyTransaction('guid', '2000000000000000000', 'Qm', 0, 123, bounty_metadata(1)),
+    BountyTransaction('guid', '2000000000000000000', 'Qm', 1, 123, bounty_metadata(256)),
+    AssertionTransaction('guid', True, '1000', verdict_metadata(1)),
+    AssertionTransaction('guid', False, '1000', verdict_metadata(512)),
+    VoteTransaction('guid', True),
+    WithdrawalTransaction('2000000000000000000'),
+    ApproveNectarReleaseTransaction('0x0000000000000000000000000000000000000001', '200000000000000000', '0x0', '0x0',
+                                    '0x1'),
+    OddTransaction('unicode é中  "quoted" \\ \n', 1e-7, None, (1, 'two', [3]), Point(1.5, -0.0),
+                   [Point(float('inf'), float('nan'))],
+                   {1: 'int key', False: 'bool key', 2.5: 'float key', None: [], 'nested': {}}),
+    CustomTransaction(data_body=json.dumps({'spam': 'eggs', 'pi': 3.14159, 'list': [None, True]})),
+]
+
+
+@pytest.mark.parametrize('transaction', TRANSACTIONS, ids=lambda t: t.__class__.__name__)
+def test_serialize_data_matches_asdict(transaction):
+    assert transaction.serialize_data() == json.dumps(transaction.data)
+
+
+@pytest.mark.parametrize('transaction', TRANSACTIONS, ids=lambda t: t.__class__.__name__)
+def test_message_matches_json_dumps(transaction, ethereum_accounts):
+    signer = Signer(ethereum_accounts[0].key)
+    assert signer.message(transaction) == json.dumps({
+        'name': transaction_name(transaction.__class__),
+        'from': ethereum_accounts[0].address,
+        'data': transaction.data,
+    })
+
+
+def test_serializer_is_cached():
+    assert get_serializer(VoteTransaction) is get_serializer(VoteTransaction)
+
+
+def test_serializer_does_not_copy_fields(monkeypatch):
+    monkeypatch.setattr(dataclasses, 'asdict', pytest.fail)
+    transaction = VoteTransaction('guid', True)
+    assert compile_serializer(VoteTransaction)(transaction) == '{"guid": "guid", "vote": true}'
+
+
+def test_serializer_rejects_unknown_types():
+    with pytest.raises(TypeError):
+        compile_serializer(SingleFieldTransaction)(SingleFieldTransaction(object()))
@@ -0,0 +1,31 @@
+import json
+import subprocess
+import sys
+import pytest
+
+from polyswarmtransaction import hashing, transaction
+from polyswarmtransaction.transaction import SignedTransaction, Transaction
+
+# Loaded on first use only, see benchmarks/startup.py
+LAZY_MODULES = ('asyncio', 'concurrent.futures', 'Crypto', 'eth_account', 'eth_hash', 'eth_keys', 'eth_utils',
+                'jsonschema', 'multiprocessing', 'web3')
+
+
+@pytest.mark.parametrize('statement', ['import polyswarmtransaction', 'import polyswarmtransaction.__main__'])
+def test_import_loads_no_lazy_module(statement):
+    check = f'{statement}\nimport json, sys\nprint(json.dumps([m for m in {LAZY_MODULES!r} if m in sys.modules]))'
+    output = subprocess.run([sys.executable, '-c', check], check=True, stdout=subprocess.PIPE).stdout
+    assert json.loads(output) == []
+
+
+def test_lazy_ecc_backend(monkeypatch, ethereum_accounts):
+    monkeypatch.setattr(transaction, '_ecc_backend', None)
+    signed = Transaction().sign(ethereum_accounts[0].key)
+    backend = transaction.get_ecc_backend()
+    assert SignedTransaction(**signed.payload).verify().sender == ethereum_accounts[0].address
+    assert transaction.get_ecc_backend() is backend
+
+
+def test_lazy_keccak(monkeypatch):
+    monkeypatch.setattr(hashing, '_keccak', None)
+    assert hashing.keccak('abc') == hashing.load_keccak()(b'abc')
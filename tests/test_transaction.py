@@ -1,15 +1,25 @@
+import dataclasses
+import importlib
+import io
 import json
+import mmap
+import pickle
 import pytest
+import tracemalloc
 
 from deepdiff import DeepDiff
+from typing import List
+from eth_keys.backends import is_coincurve_available
 from eth_keys.datatypes import PrivateKey
 from hexbytes import HexBytes
 from jsonschema import ValidationError
 from web3 import Web3
 
+from polyswarmtransaction import codec, transaction
 from polyswarmtransaction.exceptions import InvalidKeyError, InvalidSignatureError, WrongSignatureError, \
-    UnsupportedTransactionError
-from polyswarmtransaction.transaction import Transaction, SignedTransaction, CustomTransaction
+    UnsupportedTransactionError, SlowBackendError
+from polyswarmtransaction.transaction import Transaction, SignedTransaction, CustomTransaction, Signer, registry, \
+    StreamSignature
 
 
 def test_recover_when_computed(ethereum_accounts):
@@ -147,9 +157,11 @@ def test_load_transaction_schema_mismatch():
         signed.transaction()
 
 
-def test_load_transaction_missing_module():
+@pytest.mark.parametrize('name', ['polyswarmtransaction.no:Transaction', 'nonexistent.sub:Transaction',
+                                  '.relative:Transaction'])
+def test_load_transaction_missing_module(name):
     transaction = {
-        'name': 'polyswarmtransaction.no:Transaction',
+        'name': name,
         'from': '0x3f17f1962B36e491b30A40b2405849e597Ba5FB5',
         'data': {}
     }
@@ -189,3 +201,286 @@ def test_load_transaction():
     signed = SignedTransaction(json.dumps(transaction), bytes([0] * 65))
     assert isinstance(signed.transaction(), Transaction)
     assert not DeepDiff(signed.transaction().data, Transaction().data, ignore_order=True)
+
+
+def test_verify_signed_transaction(ethereum_accounts):
+    signed = Transaction().sign(ethereum_accounts[0].key)
+    verified = SignedTransaction(**signed.payload).verify()
+    assert verified.sender == '0x3f17f1962B36e491b30A40b2405849e597Ba5FB5'
+    assert verified.body == json.loads(signed.raw_transaction)
+    assert verified.transaction == Transaction()
+
+
+def test_verify_parses_and_hashes_once(ethereum_accounts, monkeypatch):
+    signed = SignedTransaction(**Transaction().sign(ethereum_accounts[0].key).payload)
+    calls = []
+    original_loads = codec.loads
+    original_hash = Transaction.hash
+
+    monkeypatch.setattr(codec, 'loads', lambda data: calls.append('loads') or original_loads(data))
+    monkeypatch.setattr(Transaction, 'hash',
+                        staticmethod(lambda message: calls.append('hash') or original_hash(message)))
+
+    signed.verify()
+    signed.ecrecover()
+    signed.transaction()
+    assert sorted(calls) == ['hash', 'loads']
+    assert signed.message_hash == original_hash(signed.raw_transaction)
+
+
+def test_verify_wrong_signature(ethereum_accounts):
+    transaction = Transaction().sign(ethereum_accounts[0].key).raw_transaction
+    signature = Transaction().sign(ethereum_accounts[1].key).signature
+    with pytest.raises(WrongSignatureError):
+        SignedTransaction(transaction, signature).verify()
+
+
+@pytest.fixture
+def restricted_registry():
+    yield registry
+    registry.unrestrict()
+
+
+def test_registry_registers_subclasses():
+    assert registry.get('polyswarmtransaction.transaction:Transaction') is Transaction
+    assert registry.get('polyswarmtransaction.transaction:CustomTransaction') is CustomTransaction
+
+
+def test_registry_preload():
+    registry.preload('polyswarmtransaction.nectar')
+    from polyswarmtransaction.nectar import WithdrawalTransaction
+    assert registry.transactions['polyswarmtransaction.nectar:WithdrawalTransaction'] is WithdrawalTransaction
+
+
+def test_registry_imports_aliases():
+    assert registry.get('polyswarmtransaction:Transaction') is Transaction
+    assert registry.transactions['polyswarmtransaction:Transaction'] is Transaction
+
+
+def test_registry_restricted_skips_import(restricted_registry, monkeypatch):
+    restricted_registry.restrict(['polyswarmtransaction.transaction:Transaction'])
+    monkeypatch.setattr(importlib, 'import_module', pytest.fail)
+    assert restricted_registry.get('polyswarmtransaction.transaction:Transaction') is Transaction
+    with pytest.raises(UnsupportedTransactionError):
+        restricted_registry.get('polyswarmtransaction.transaction:CustomTransaction')
+    with pytest.raises(UnsupportedTransactionError):
+        restricted_registry.get('polyswarmtransaction.no:Transaction')
+
+
+def test_load_transaction_not_allowed(restricted_registry):
+    restricted_registry.restrict([])
+    transaction = {
+        'name': 'polyswarmtransaction.transaction:Transaction',
+        'from': '0x3f17f1962B36e491b30A40b2405849e597Ba5FB5',
+        'data': {}
+    }
+    signed = SignedTransaction(json.dumps(transaction), bytes([0] * 65))
+    with pytest.raises(UnsupportedTransactionError):
+        signed.transaction()
+
+
+def test_signer_matches_sign(ethereum_accounts):
+    signer = Signer(ethereum_accounts[0].key)
+    assert signer.address == '0x3f17f1962B36e491b30A40b2405849e597Ba5FB5'
+    assert signer.sign(Transaction()).payload == Transaction().sign(ethereum_accounts[0].key).payload
+    custom = CustomTransaction(data_body=json.dumps({'spam': 'eggs', 'pi': 3, 'it_moves': True}))
+    assert signer.sign(custom).payload == custom.sign(ethereum_accounts[0].key).payload
+
+
+def test_signer_message_matches_json_dumps(ethereum_accounts):
+    signer = Signer(PrivateKey(ethereum_accounts[0].key))
+    custom = CustomTransaction(data_body=json.dumps({'unicode': 'é中', 'nested': [{'a': None, 'b': 1.5}]}))
+    assert signer.message(custom) == json.dumps({
+        'name': 'polyswarmtransaction.transaction:CustomTransaction',
+        'from': '0x3f17f1962B36e491b30A40b2405849e597Ba5FB5',
+        'data': custom.data,
+    })
+
+
+def test_signer_sign_many(ethereum_accounts):
+    signer = Signer(ethereum_accounts[1].key)
+    signed = signer.sign_many([Transaction(), CustomTransaction(data_body='{"a": 1}')])
+    assert [s.ecrecover() for s in signed] == [ethereum_accounts[1].address] * 2
+    assert isinstance(signed[1].transaction(), CustomTransaction)
+
+
+def test_signer_invalid_key():
+    with pytest.raises(InvalidKeyError):
+        Signer(None)
+
+
+@pytest.mark.parametrize('convert', [bytes, bytearray, memoryview], ids=lambda c: c.__name__)
+def test_verify_buffer_input(ethereum_accounts, convert):
+    signed = Signer(ethereum_accounts[0].key).sign(Transaction())
+    raw = convert(signed.raw_transaction.encode())
+    signature = memoryview(bytes(signed.signature))
+    buffered = SignedTransaction(raw, signature)
+    assert buffered.message_hash == signed.message_hash
+    assert buffered.verify().sender == ethereum_accounts[0].address
+    assert buffered.payload == signed.payload
+
+
+def test_signed_transaction_is_slotted(ethereum_accounts):
+    signed = Transaction().sign(ethereum_accounts[0].key)
+    assert not hasattr(signed, '__dict__')
+    assert isinstance(signed.signature, HexBytes)
+
+    loaded = pickle.loads(pickle.dumps(signed))
+    assert loaded.payload == signed.payload
+    assert loaded.verify().sender == ethereum_accounts[0].address
+
+
+def test_signed_transaction_set_signature(ethereum_accounts):
+    signed = Transaction().sign(ethereum_accounts[0].key)
+    signed.ecrecover()
+    signed.signature = Transaction().sign(ethereum_accounts[1].key).signature.hex()
+    with pytest.raises(WrongSignatureError):
+        signed.ecrecover()
+
+
+def test_signed_transaction_set_raw_transaction(ethereum_accounts):
+    signed = Transaction().sign(ethereum_accounts[0].key)
+    assert signed.ecrecover() == ethereum_accounts[0].address
+    assert signed.transaction() == Transaction()
+
+    tampered = CustomTransaction(data_body='{}').sign(ethereum_accounts[0].key).raw_transaction
+    signed.raw_transaction = tampered
+    assert signed.message_hash == Web3.keccak(text=tampered)
+    assert isinstance(signed.transaction(), CustomTransaction)
+    with pytest.raises(WrongSignatureError):
+        signed.ecrecover()
+
+
+@pytest.fixture
+def ecc_backend():
+    name = transaction.ecc_backend_name()
+    yield
+    transaction.set_ecc_backend(name, production=False)
+
+
+def test_default_ecc_backend_is_fastest_installed():
+    expected = 'coincurve' if is_coincurve_available() else 'native'
+    assert transaction.ecc_backend_name() == expected
+    assert transaction.available_ecc_backends()[0] == expected
+
+
+@pytest.mark.parametrize('name', transaction.available_ecc_backends())
+def test_set_ecc_backend(ethereum_accounts, ecc_backend, name):
+    transaction.set_ecc_backend(name, production=False)
+    assert transaction.ecc_backend_name() == name
+    backend = transaction.get_ecc_backend()
+    assert type(backend) is type(transaction.load_ecc_backend(name))
+    assert transaction.get_ecc_backend() is backend
+
+    key = bytes([1] * 32)
+    signed = Transaction().sign(key)
+    assert signed.verify().sender == PrivateKey(key).public_key.to_checksum_address()
+
+
+def test_set_unknown_ecc_backend(ecc_backend, monkeypatch):
+    monkeypatch.setattr(transaction, 'is_coincurve_available', lambda: False)
+    for name in ('nope', 'coincurve'):
+        with pytest.raises(ValueError):
+            transaction.set_ecc_backend(name)
+
+
+def test_production_refuses_slow_ecc_backend(ecc_backend, monkeypatch):
+    monkeypatch.setattr(transaction, 'is_coincurve_available', lambda: False)
+    with pytest.raises(SlowBackendError):
+        transaction.set_ecc_backend(production=True)
+
+    monkeypatch.setenv(transaction.PRODUCTION_ENVIRONMENT_VARIABLE, '1')
+    with pytest.raises(SlowBackendError):
+        transaction.set_ecc_backend('native')
+    assert transaction.ecc_backend_name() == 'native'
+
+
+@pytest.mark.parametrize('value, production', [('1', True), ('true', True), (' YES ', True), ('on', True),
+                                               ('0', False), ('false', False), ('no', False), ('', False)])
+def test_production_environment_values(ecc_backend, monkeypatch, value, production):
+    monkeypatch.setattr(transaction, 'is_coincurve_available', lambda: False)
+    monkeypatch.setenv(transaction.PRODUCTION_ENVIRONMENT_VARIABLE, value)
+    assert transaction.is_production_environment() is production
+    if production:
+        with pytest.raises(SlowBackendError):
+            transaction.set_ecc_backend()
+    else:
+        transaction.set_ecc_backend()
+        assert transaction.ecc_backend_name() == 'native'
+
+
+@dataclasses.dataclass
+class ListTransaction(Transaction):
+    items: List[str]
+
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 64 * 1024])
+def test_sign_stream_matches_sign(ethereum_accounts, chunk_size):
+    signer = Signer(ethereum_accounts[0].key)
+    for tx in (Transaction(), CustomTransaction(data_body='{"unicode": "é中", "nested": [1.5, null]}'),
+               ListTransaction([f'item {i}' for i in range(100)])):
+        sink = io.BytesIO()
+        streamed = signer.sign_stream(tx, sink, chunk_size)
+        signed = signer.sign(tx)
+        assert sink.getvalue() == signed.raw_transaction.encode()
+        assert streamed == StreamSignature(bytes(signed.signature), signed.message_hash, len(sink.getvalue()))
+
+
+def test_sign_stream_memory_does_not_grow(ethereum_accounts):
+    signer = Signer(ethereum_accounts[0].key)
+    large = ListTransaction(['x' * 100] * 100000)
+
+    class NullSink:
+        size = 0
+
+        def write(self, data):
+            self.size += len(data)
+
+    sink = NullSink()
+    tracemalloc.start()
+    try:
+        signer.sign_stream(large, sink)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    assert sink.size > 10 * 1000 * 1000
+    assert peak < 1024 * 1024
+
+
+@pytest.mark.parametrize('opener', ['path', 'file', 'mmap'])
+def test_verify_from_file(ethereum_accounts, tmp_path, opener):
+    path = tmp_path / 'message'
+    transaction = ListTransaction([f'item {i}' for i in range(1000)])
+    with open(path, 'wb') as sink:
+        streamed = Signer(ethereum_accounts[0].key).sign_stream(transaction, sink, chunk_size=1024)
+
+    with open(path, 'rb') as file:
+        if opener == 'path':
+            signed = SignedTransaction.from_file(str(path), streamed.signature)
+        elif opener == 'file':
+            signed = SignedTransaction.from_file(file, streamed.signature)
+        else:
+            signed = SignedTransaction.from_file(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ),
+                                                 streamed.signature)
+
+    assert signed.message_hash == streamed.message_hash
+    verified = signed.verify()
+    assert verified.sender == ethereum_accounts[0].address
+    assert verified.transaction == transaction
+
+
+def test_verify_from_tampered_file(ethereum_accounts, tmp_path):
+    path = tmp_path / 'message'
+    with open(path, 'wb') as sink:
+        streamed = Signer(ethereum_accounts[0].key).sign_stream(ListTransaction(['a']), sink)
+    path.write_bytes(path.read_bytes().replace(b'"a"', b'"b"'))
+
+    with pytest.raises(WrongSignatureError):
+        SignedTransaction.from_file(path, streamed.signature).verify()
+
+
+def test_verify_from_empty_file(ethereum_accounts, tmp_path):
+    path = tmp_path / 'message'
+    path.write_bytes(b'')
+    signed = SignedTransaction.from_file(path, Transaction().sign(ethereum_accounts[0].key).signature)
+    assert signed.message_hash == Web3.keccak(b'')
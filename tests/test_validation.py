@@ -0,0 +1,85 @@
+import dataclasses
+import pytest
+
+from jsonschema import ValidationError
+from typing import Any, Dict, List, Optional
+
+from polyswarmtransaction.exceptions import WrongPayloadError
+from polyswarmtransaction.transaction import Transaction, TRANSACTION_SCHEMA, TRANSACTION_VALIDATOR
+from polyswarmtransaction.validation import (LazySchemaValidator, compile_decoder, compile_type_checker, get_decoder,
+                                             validate)
+
+
+@dataclasses.dataclass
+class TypedTransaction(Transaction):
+    count: int
+    flag: bool
+    ratio: float
+    names: List[str]
+    extra: Dict[str, Any]
+    note: Optional[str] = None
+
+
+def test_validate_envelope():
+    validate(TRANSACTION_VALIDATOR, {'name': 'a:b', 'from': '0x' + '0' * 40, 'data': {}})
+
+
+def test_validate_envelope_mismatch():
+    with pytest.raises(ValidationError):
+        validate(TRANSACTION_VALIDATOR, {'name': 'a', 'from': '0x' + '0' * 40, 'data': {}})
+
+
+def test_lazy_validator_compiles_once():
+    validator = LazySchemaValidator(TRANSACTION_SCHEMA)
+    validate(validator, {'name': 'a:b', 'from': '0x' + '0' * 40, 'data': {}})
+    assert validator.validator is validator.validator
+    with pytest.raises(ValidationError):
+        validate(validator, {'name': 'a:b', 'data': {}})
+
+
+def test_decoder_is_cached():
+    assert get_decoder(TypedTransaction) is get_decoder(TypedTransaction)
+
+
+def test_decode_valid():
+    data = {'count': 1, 'flag': False, 'ratio': 1, 'names': ['a'], 'extra': {'a': [1]}}
+    assert compile_decoder(TypedTransaction)(data) is data
+    assert TypedTransaction.from_data(data) == TypedTransaction(1, False, 1, ['a'], {'a': [1]})
+
+
+def test_decode_optional_field():
+    data = {'count': 1, 'flag': False, 'ratio': 0.5, 'names': [], 'extra': {}, 'note': None}
+    assert TypedTransaction.from_data(data).note is None
+
+
+@pytest.mark.parametrize('field,value', [
+    ('count', True),
+    ('count', '1'),
+    ('flag', 1),
+    ('ratio', '0.5'),
+    ('names', 'a'),
+    ('names', [1]),
+    ('extra', []),
+    ('note', 1),
+])
+def test_decode_wrong_type(field, value):
+    data = {'count': 1, 'flag': False, 'ratio': 0.5, 'names': [], 'extra': {}}
+    data[field] = value
+    with pytest.raises(WrongPayloadError):
+        TypedTransaction.from_data(data)
+
+
+def test_decode_missing_field():
+    with pytest.raises(WrongPayloadError):
+        TypedTransaction.from_data({'count': 1})
+
+
+def test_decode_unexpected_field():
+    data = {'count': 1, 'flag': False, 'ratio': 0.5, 'names': [], 'extra': {}, 'spam': 'eggs'}
+    with pytest.raises(WrongPayloadError):
+        TypedTransaction.from_data(data)
+
+
+def test_unknown_annotation_is_not_checked():
+    assert compile_type_checker(object) is None
+    assert compile_type_checker(Any) is None